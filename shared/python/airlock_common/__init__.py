@@ -42,6 +42,7 @@ except ImportError:
 from .utils import (
     setup_logging,
     get_logger,
+    JsonFormatter,
     AirlockError,
     ValidationError,
     NotFoundError,
@@ -50,8 +51,11 @@ from .utils import (
     ConflictError,
     ServiceUnavailableError,
     validate_email,
+    validate_emails,
     validate_url,
+    validate_urls,
     validate_uuid,
+    validate_uuids,
     get_env,
     get_env_int,
     get_env_bool,
@@ -60,6 +64,7 @@ from .utils import (
     create_access_token,
     create_refresh_token,
     decode_token,
+    clear_token_cache,
     create_user_access_token,
     create_user_refresh_token,
     create_api_key_access_token,
@@ -117,6 +122,7 @@ __all__ = [
     "DLX_EXCHANGE",
     "setup_logging",
     "get_logger",
+    "JsonFormatter",
     "AirlockError",
     "ValidationError",
     "NotFoundError",
@@ -125,8 +131,11 @@ __all__ = [
     "ConflictError",
     "ServiceUnavailableError",
     "validate_email",
+    "validate_emails",
     "validate_url",
+    "validate_urls",
     "validate_uuid",
+    "validate_uuids",
     "get_env",
     "get_env_int",
     "get_env_bool",
@@ -135,6 +144,7 @@ __all__ = [
     "create_access_token",
     "create_refresh_token",
     "decode_token",
+    "clear_token_cache",
     "create_user_access_token",
     "create_user_refresh_token",
     "create_api_key_access_token",
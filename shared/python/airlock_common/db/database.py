@@ -2,7 +2,7 @@
 Database connection and session management
 """
 import os
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Mapping, Optional
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -85,18 +85,23 @@ class Database:
                 await session.close()
 
 
-def get_database_url() -> str:
+def get_database_url(env: Optional[Mapping[str, str]] = None) -> str:
     """
     Get database URL from environment variables
     
+    Args:
+        env: Variables to read instead of os.environ
+    
     Returns:
         str: Database connection URL in asyncpg format
     """
-    host = os.getenv("POSTGRES_HOST", "localhost")
-    port = os.getenv("POSTGRES_PORT", "5432")
-    db = os.getenv("POSTGRES_DB", "airlock")
-    user = os.getenv("POSTGRES_USER", "airlock")
-    password = os.getenv("POSTGRES_PASSWORD", "airlock")
+    if env is None:
+        env = os.environ
+    host = env.get("POSTGRES_HOST", "localhost")
+    port = env.get("POSTGRES_PORT", "5432")
+    db = env.get("POSTGRES_DB", "airlock")
+    user = env.get("POSTGRES_USER", "airlock")
+    password = env.get("POSTGRES_PASSWORD", "airlock")
     
     return f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db}"
 
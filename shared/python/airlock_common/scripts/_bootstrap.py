@@ -0,0 +1,18 @@
+"""
+Shared path setup for the airlock_common helper scripts
+"""
+import sys
+from pathlib import Path
+
+
+def ensure_on_path() -> None:
+    """
+    Make airlock_common importable when a script is run directly
+
+    Adds shared/python/ (the directory containing the airlock_common
+    package) to sys.path once, so repeated calls from several scripts in
+    the same process do not grow the import search path.
+    """
+    python_dir = str(Path(__file__).resolve().parents[2])
+    if python_dir not in sys.path:
+        sys.path.insert(0, python_dir)
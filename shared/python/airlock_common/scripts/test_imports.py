@@ -3,120 +3,130 @@
 Test script to verify all airlock_common imports work correctly
 """
 import sys
-import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _bootstrap import ensure_on_path
+
+ensure_on_path()
+
+# Public names airlock_common must export, grouped for reporting
+EXPECTED_EXPORTS = (
+    ("Utility", (
+        "setup_logging",
+        "get_logger",
+        "JsonFormatter",
+        "validate_email",
+        "validate_emails",
+        "validate_url",
+        "validate_urls",
+        "validate_uuid",
+        "validate_uuids",
+        "get_env",
+        "get_env_int",
+        "get_env_bool",
+        "get_env_list",
+    )),
+    ("Error", (
+        "AirlockError",
+        "ValidationError",
+        "NotFoundError",
+        "UnauthorizedError",
+        "ForbiddenError",
+        "ConflictError",
+        "ServiceUnavailableError",
+    )),
+    ("Constants", (
+        "API_VERSION",
+        "API_PREFIX",
+        "HEALTH_ENDPOINT",
+        "HTTP_STATUS_OK",
+        "HTTP_STATUS_CREATED",
+        "HTTP_STATUS_BAD_REQUEST",
+        "HTTP_STATUS_UNAUTHORIZED",
+        "HTTP_STATUS_FORBIDDEN",
+        "HTTP_STATUS_NOT_FOUND",
+        "HTTP_STATUS_CONFLICT",
+        "HTTP_STATUS_INTERNAL_SERVER_ERROR",
+        "HTTP_STATUS_SERVICE_UNAVAILABLE",
+        "ERROR_CODE_VALIDATION_ERROR",
+        "ERROR_CODE_NOT_FOUND",
+        "ERROR_CODE_UNAUTHORIZED",
+        "ERROR_CODE_FORBIDDEN",
+        "ERROR_CODE_CONFLICT",
+        "ERROR_CODE_INTERNAL_SERVER_ERROR",
+        "ERROR_CODE_SERVICE_UNAVAILABLE",
+        "ROLE_SUBMITTER",
+        "ROLE_REVIEWER",
+        "ROLE_ADMIN",
+        "ROLES",
+    )),
+    ("Database", (
+        "get_db",
+        "Database",
+        "Base",
+        "User",
+        "PackageSubmission",
+        "PackageRequest",
+        "Package",
+        "Workflow",
+        "CheckResult",
+        "AuditLog",
+        "APIKey",
+        "PackageUsage",
+        "LicenseAllowlist",
+    )),
+    # May be None if pika is not installed, but must still be exported
+    ("Messaging", (
+        "get_rabbitmq_connection",
+        "RabbitMQConnection",
+        "PACKAGE_EVENTS_EXCHANGE",
+        "WORKFLOW_EVENTS_EXCHANGE",
+        "CHECK_EVENTS_EXCHANGE",
+        "DLX_EXCHANGE",
+    )),
+)
+
 
 def test_imports():
     """Test all imports from airlock_common"""
     print("Testing airlock_common imports...")
     
     try:
-        # Test utility imports
-        from airlock_common import (
-            setup_logging,
-            get_logger,
-            validate_email,
-            validate_url,
-            validate_uuid,
-            get_env,
-            get_env_int,
-            get_env_bool,
-            get_env_list,
-        )
-        print("[OK] Utility imports successful")
-        
-        # Test error imports
-        from airlock_common import (
-            AirlockError,
-            ValidationError,
-            NotFoundError,
-            UnauthorizedError,
-            ForbiddenError,
-            ConflictError,
-            ServiceUnavailableError,
-        )
-        print("[OK] Error imports successful")
+        import airlock_common as ac
         
-        # Test constants imports
-        from airlock_common import (
-            API_VERSION,
-            API_PREFIX,
-            HEALTH_ENDPOINT,
-            HTTP_STATUS_OK,
-            HTTP_STATUS_CREATED,
-            HTTP_STATUS_BAD_REQUEST,
-            HTTP_STATUS_UNAUTHORIZED,
-            HTTP_STATUS_FORBIDDEN,
-            HTTP_STATUS_NOT_FOUND,
-            HTTP_STATUS_CONFLICT,
-            HTTP_STATUS_INTERNAL_SERVER_ERROR,
-            HTTP_STATUS_SERVICE_UNAVAILABLE,
-            ERROR_CODE_VALIDATION_ERROR,
-            ERROR_CODE_NOT_FOUND,
-            ERROR_CODE_UNAUTHORIZED,
-            ERROR_CODE_FORBIDDEN,
-            ERROR_CODE_CONFLICT,
-            ERROR_CODE_INTERNAL_SERVER_ERROR,
-            ERROR_CODE_SERVICE_UNAVAILABLE,
-            ROLE_SUBMITTER,
-            ROLE_REVIEWER,
-            ROLE_ADMIN,
-            ROLES,
-        )
-        print("[OK] Constants imports successful")
-        
-        # Test database imports
-        from airlock_common import (
-            get_db,
-            Database,
-            Base,
-            User,
-            PackageSubmission,
-            PackageRequest,
-            Package,
-            Workflow,
-            CheckResult,
-            AuditLog,
-            APIKey,
-            PackageUsage,
-            LicenseAllowlist,
-        )
-        print("[OK] Database imports successful")
-        
-        # Test messaging imports (may be None if pika not installed)
-        from airlock_common import (
-            get_rabbitmq_connection,
-            RabbitMQConnection,
-            PACKAGE_EVENTS_EXCHANGE,
-            WORKFLOW_EVENTS_EXCHANGE,
-            CHECK_EVENTS_EXCHANGE,
-            DLX_EXCHANGE,
-        )
-        print("[OK] Messaging imports successful")
+        for group, names in EXPECTED_EXPORTS:
+            missing = [name for name in names if not hasattr(ac, name)]
+            assert not missing, f"{group} exports missing: {missing}"
+            print(f"[OK] {group} imports successful")
         
         # Test utility functions
         print("\nTesting utility functions...")
-        assert validate_email("test@example.com") == True
-        assert validate_email("invalid-email") == False
-        print("[OK] validate_email works")
-        
-        assert validate_url("https://example.com") == True
-        assert validate_url("invalid-url") == False
-        print("[OK] validate_url works")
-        
-        assert validate_uuid("123e4567-e89b-12d3-a456-426614174000") == True
-        assert validate_uuid("invalid-uuid") == False
-        print("[OK] validate_uuid works")
+        validator_checks = [
+            (ac.validate_email, "test@example.com", True),
+            (ac.validate_email, "invalid-email", False),
+            (ac.validate_url, "https://example.com", True),
+            (ac.validate_url, "invalid-url", False),
+            (ac.validate_uuid, "123e4567-e89b-12d3-a456-426614174000", True),
+            (ac.validate_uuid, "invalid-uuid", False),
+        ]
+        for validator, value, expected in validator_checks:
+            assert validator(value) is expected, f"{validator.__name__}({value!r}) should be {expected}"
+        batch_checks = [
+            (ac.validate_emails, ["test@example.com", "invalid-email"]),
+            (ac.validate_urls, ["https://example.com", "invalid-url"]),
+            (ac.validate_uuids, ["123e4567-e89b-12d3-a456-426614174000", "invalid-uuid"]),
+        ]
+        for validator, values in batch_checks:
+            results = validator(values)
+            assert results == [True, False], f"{validator.__name__} returned {results}"
+        print("[OK] validators and their batch versions work")
         
         # Test constants
         print("\nTesting constants...")
-        print(f"  API_VERSION: {API_VERSION}")
-        print(f"  API_PREFIX: {API_PREFIX}")
-        print(f"  ROLE_SUBMITTER: {ROLE_SUBMITTER}")
-        print(f"  HTTP_STATUS_OK: {HTTP_STATUS_OK}")
-        print(f"  ERROR_CODE_VALIDATION_ERROR: {ERROR_CODE_VALIDATION_ERROR}")
+        print(f"  API_VERSION: {ac.API_VERSION}")
+        print(f"  API_PREFIX: {ac.API_PREFIX}")
+        print(f"  ROLE_SUBMITTER: {ac.ROLE_SUBMITTER}")
+        print(f"  HTTP_STATUS_OK: {ac.HTTP_STATUS_OK}")
+        print(f"  ERROR_CODE_VALIDATION_ERROR: {ac.ERROR_CODE_VALIDATION_ERROR}")
         
         print("\n" + "=" * 60)
         print("All tests passed!")
@@ -3,16 +3,11 @@
 Simple test script for models (no pytest required)
 Tests that all models can be imported and have correct structure
 """
-import os
 import sys
-from sqlalchemy import inspect
 
-# Add parent directory to path so we can import airlock_common
-script_dir = os.path.dirname(os.path.abspath(__file__))
-package_dir = os.path.dirname(script_dir)
-python_dir = os.path.dirname(package_dir)
-if python_dir not in sys.path:
-    sys.path.insert(0, python_dir)
+from _bootstrap import ensure_on_path
+
+ensure_on_path()
 
 from airlock_common.db.models import (
     User,
@@ -30,6 +25,12 @@ from airlock_common.db.models import (
 
 def test_models():
     """Test that all models can be imported and have correct structure"""
+    from sqlalchemy import inspect
+    from sqlalchemy.orm import configure_mappers
+    
+    # Configure all mappers upfront so each inspect() below is a plain lookup
+    configure_mappers()
+    
     print("=" * 60)
     print("Testing Database Models")
     print("=" * 60)
@@ -63,11 +64,9 @@ def test_models():
     
     # Test User model
     try:
-        mapper = inspect(User)
-        user_columns = [col.key for col in mapper.columns]
-        required_columns = ["id", "username", "email", "roles", "created_at", "updated_at"]
-        for col in required_columns:
-            assert col in user_columns, f"User model missing column: {col}"
+        required_columns = {"id", "username", "email", "roles", "created_at", "updated_at"}
+        missing = required_columns.difference(inspect(User).columns.keys())
+        assert not missing, f"User model missing columns: {sorted(missing)}"
         print("  ✓ User model structure correct")
     except Exception as e:
         print(f"  ✗ User model structure: {e}")
@@ -75,11 +74,9 @@ def test_models():
     
     # Test PackageSubmission model
     try:
-        mapper = inspect(PackageSubmission)
-        submission_columns = [col.key for col in mapper.columns]
-        required_columns = ["id", "user_id", "project_name", "project_version", "package_lock_json", "status", "created_at", "updated_at"]
-        for col in required_columns:
-            assert col in submission_columns, f"PackageSubmission model missing column: {col}"
+        required_columns = {"id", "user_id", "project_name", "project_version", "package_lock_json", "status", "created_at", "updated_at"}
+        missing = required_columns.difference(inspect(PackageSubmission).columns.keys())
+        assert not missing, f"PackageSubmission model missing columns: {sorted(missing)}"
         print("  ✓ PackageSubmission model structure correct")
     except Exception as e:
         print(f"  ✗ PackageSubmission model structure: {e}")
@@ -4,15 +4,23 @@ Tests RabbitMQ connection and configuration without requiring database models
 """
 import sys
 import os
+from typing import List
+
+from _bootstrap import ensure_on_path
+
+ensure_on_path()
+
+
+def _write(out: List[str]) -> None:
+    """Write collected output lines to stdout in a single call"""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
-# Add parent directory to path for imports
-script_dir = os.path.dirname(os.path.abspath(__file__))
-shared_dir = os.path.dirname(os.path.dirname(script_dir))
-sys.path.insert(0, shared_dir)
 
 def test_imports():
     """Test that messaging modules can be imported"""
-    print("Testing imports...")
+    out = ["Testing imports..."]
     try:
         from airlock_common.messaging.connection import get_rabbitmq_connection
         from airlock_common.messaging.exchanges import (
@@ -21,32 +29,36 @@ def test_imports():
             CHECK_EVENTS_EXCHANGE,
             DLX_EXCHANGE,
         )
-        print("[OK] Messaging imports successful")
+        out.append("[OK] Messaging imports successful")
         return True
     except ImportError as e:
-        print(f"[ERROR] Import failed: {e}")
-        print("\nPlease install dependencies:")
-        print("  pip install -r requirements.txt")
+        out.append(f"[ERROR] Import failed: {e}")
+        out.append("\nPlease install dependencies:")
+        out.append("  pip install -r requirements.txt")
         return False
+    finally:
+        _write(out)
 
 
 def test_pika_installed():
     """Test that pika is installed"""
-    print("\nTesting pika installation...")
+    out = ["\nTesting pika installation..."]
     try:
         import pika
-        print(f"[OK] pika installed (version: {pika.__version__ if hasattr(pika, '__version__') else 'unknown'})")
+        out.append(f"[OK] pika installed (version: {pika.__version__ if hasattr(pika, '__version__') else 'unknown'})")
         return True
     except ImportError:
-        print("[ERROR] pika not installed")
-        print("\nPlease install pika:")
-        print("  pip install pika>=1.3.2,<2.0.0")
+        out.append("[ERROR] pika not installed")
+        out.append("\nPlease install pika:")
+        out.append("  pip install pika>=1.3.2,<2.0.0")
         return False
+    finally:
+        _write(out)
 
 
 def test_environment_variables():
     """Test that environment variables are set"""
-    print("\nTesting environment variables...")
+    out = ["\nTesting environment variables..."]
     required_vars = ["RABBITMQ_HOST", "RABBITMQ_PORT", "RABBITMQ_USER", "RABBITMQ_PASSWORD"]
     missing_vars = []
     defaults = {
@@ -62,32 +74,79 @@ def test_environment_variables():
             default_value = defaults.get(var, "not set")
             if "PASSWORD" in var:
                 default_value = "*** (guest)"
-            print(f"[WARN] {var} not set (will use default: {default_value})")
+            out.append(f"[WARN] {var} not set (will use default: {default_value})")
         else:
             # Mask password
             value = os.environ[var]
             if "PASSWORD" in var:
                 value = "***" if value else "not set"
-            print(f"[OK] {var} = {value}")
+            out.append(f"[OK] {var} = {value}")
     
     if missing_vars:
-        print(f"\n[WARN] Missing environment variables: {', '.join(missing_vars)}")
-        print("Using defaults:")
-        print("  RABBITMQ_HOST = localhost")
-        print("  RABBITMQ_PORT = 5672")
-        print("  RABBITMQ_USER = guest")
-        print("  RABBITMQ_PASSWORD = guest")
-        print("\n  Note: If RabbitMQ uses different credentials (from .env.dev), set:")
-        print("    $env:RABBITMQ_USER = \"airlock\"  # or value from .env.dev")
-        print("    $env:RABBITMQ_PASSWORD = \"airlock\"  # or value from .env.dev")
-        return True  # Not a failure, just a warning
+        out.append(f"\n[WARN] Missing environment variables: {', '.join(missing_vars)}")
+        out.append("Using defaults:")
+        out.append("  RABBITMQ_HOST = localhost")
+        out.append("  RABBITMQ_PORT = 5672")
+        out.append("  RABBITMQ_USER = guest")
+        out.append("  RABBITMQ_PASSWORD = guest")
+        out.append("\n  Note: If RabbitMQ uses different credentials (from .env.dev), set:")
+        out.append("    $env:RABBITMQ_USER = \"airlock\"  # or value from .env.dev")
+        out.append("    $env:RABBITMQ_PASSWORD = \"airlock\"  # or value from .env.dev")
     
+    _write(out)
+    # Missing variables are not a failure, just a warning
     return True
 
 
+def _auth_help(user: str, password_display: str) -> List[str]:
+    """Troubleshooting lines for rejected credentials"""
+    return [
+        "\n[ERROR] Authentication failed!",
+        "  The credentials don't match RabbitMQ configuration.",
+        "\n  Current credentials:",
+        f"    Username: {user}",
+        f"    Password: {password_display}",
+        "\n  Solutions:",
+        "  1. Check .env.dev for RABBITMQ_USER and RABBITMQ_PASSWORD",
+        "  2. Set environment variables to match .env.dev:",
+        "     $env:RABBITMQ_USER = \"airlock\"  # or value from .env.dev",
+        "     $env:RABBITMQ_PASSWORD = \"airlock\"  # or value from .env.dev",
+        "  3. Or check RabbitMQ container logs:",
+        "     docker-compose -f docker-compose.prod.yml -f docker-compose.dev.yml --env-file .env.dev logs rabbitmq",
+        "  4. Or check what credentials RabbitMQ is using:",
+        "     docker-compose -f docker-compose.prod.yml -f docker-compose.dev.yml --env-file .env.dev exec rabbitmq env | findstr RABBITMQ",
+    ]
+
+
+def _connection_help() -> List[str]:
+    """Troubleshooting lines for an unreachable broker"""
+    return [
+        "\n[ERROR] Cannot connect to RabbitMQ!",
+        "  RabbitMQ may not be running or port is not exposed.",
+        "\n  Solutions:",
+        "  1. Start RabbitMQ:",
+        "     docker-compose -f docker-compose.prod.yml -f docker-compose.dev.yml --env-file .env.dev up -d rabbitmq",
+        "  2. Check if port is exposed:",
+        "     docker port airlock-rabbitmq",
+        "  3. Check port configuration:",
+        "     python scripts/check_rabbitmq_ports.py",
+    ]
+
+
+def _generic_help() -> List[str]:
+    """Troubleshooting lines for any other connection failure"""
+    return [
+        "\n[ERROR] Connection failed!",
+        "  Please check:",
+        "  1. RabbitMQ is running",
+        "  2. Port is exposed (5672)",
+        "  3. Credentials are correct (from .env.dev)",
+    ]
+
+
 def test_rabbitmq_connection():
     """Test RabbitMQ connection"""
-    print("\nTesting RabbitMQ connection...")
+    out = ["\nTesting RabbitMQ connection..."]
     
     # Show what credentials are being used
     host = os.getenv("RABBITMQ_HOST", "localhost")
@@ -96,101 +155,111 @@ def test_rabbitmq_connection():
     password_set = "RABBITMQ_PASSWORD" in os.environ
     password_display = "***" if password_set else "guest (default)"
     
-    print(f"  Connecting to: {host}:{port}")
-    print(f"  Username: {user}")
-    print(f"  Password: {password_display}")
+    out.append(f"  Connecting to: {host}:{port}")
+    out.append(f"  Username: {user}")
+    out.append(f"  Password: {password_display}")
+    
+    # Show the target before connecting, so it is visible while a slow
+    # connection attempt times out
+    _write(out)
+    out = []
     
+    # Imported before the try so the except clauses below can always name
+    # the pika exception classes
     try:
+        from pika.exceptions import (
+            AMQPConnectionError,
+            AuthenticationError,
+            ProbableAccessDeniedError,
+            ProbableAuthenticationError,
+        )
         from airlock_common.messaging.connection import get_rabbitmq_connection
-        
+    except ImportError as e:
+        _write([
+            f"[ERROR] Cannot import the messaging modules: {e}",
+            "\nPlease install dependencies:",
+            "  pip install -r requirements.txt",
+        ])
+        return False
+    
+    try:
         with get_rabbitmq_connection() as conn:
             channel = conn.get_channel()
             # Try to declare a test queue
             channel.queue_declare(queue="test_connection", durable=False, auto_delete=True)
             channel.queue_delete(queue="test_connection")
-            print("[OK] RabbitMQ connection successful")
+            out.append("[OK] RabbitMQ connection successful")
             return True
+    except (AuthenticationError, ProbableAuthenticationError, ProbableAccessDeniedError) as e:
+        out.append(f"[ERROR] RabbitMQ connection failed: {e!r}")
+        out.extend(_auth_help(user, password_display))
+        return False
+    except AMQPConnectionError as e:
+        out.append(f"[ERROR] RabbitMQ connection failed: {e!r}")
+        out.extend(_connection_help())
+        return False
     except Exception as e:
-        error_str = str(e)
-        print(f"[ERROR] RabbitMQ connection failed: {e}")
-        
-        # Check for authentication errors
-        if "ACCESS_REFUSED" in error_str or "403" in error_str or "Login was refused" in error_str:
-            print("\n[ERROR] Authentication failed!")
-            print("  The credentials don't match RabbitMQ configuration.")
-            print(f"\n  Current credentials:")
-            print(f"    Username: {user}")
-            print(f"    Password: {password_display}")
-            print("\n  Solutions:")
-            print("  1. Check .env.dev for RABBITMQ_USER and RABBITMQ_PASSWORD")
-            print("  2. Set environment variables to match .env.dev:")
-            print("     $env:RABBITMQ_USER = \"airlock\"  # or value from .env.dev")
-            print("     $env:RABBITMQ_PASSWORD = \"airlock\"  # or value from .env.dev")
-            print("  3. Or check RabbitMQ container logs:")
-            print("     docker-compose -f docker-compose.prod.yml -f docker-compose.dev.yml --env-file .env.dev logs rabbitmq")
-            print("  4. Or check what credentials RabbitMQ is using:")
-            print("     docker-compose -f docker-compose.prod.yml -f docker-compose.dev.yml --env-file .env.dev exec rabbitmq env | findstr RABBITMQ")
-        
-        # Check for connection errors
-        elif "connection refused" in error_str.lower() or "111" in error_str or "Connection refused" in error_str:
-            print("\n[ERROR] Cannot connect to RabbitMQ!")
-            print("  RabbitMQ may not be running or port is not exposed.")
-            print("\n  Solutions:")
-            print("  1. Start RabbitMQ:")
-            print("     docker-compose -f docker-compose.prod.yml -f docker-compose.dev.yml --env-file .env.dev up -d rabbitmq")
-            print("  2. Check if port is exposed:")
-            print("     docker port airlock-rabbitmq")
-            print("  3. Check port configuration:")
-            print("     python scripts/check_rabbitmq_ports.py")
-        else:
-            print("\n[ERROR] Connection failed!")
-            print("  Please check:")
-            print("  1. RabbitMQ is running")
-            print("  2. Port is exposed (5672)")
-            print("  3. Credentials are correct (from .env.dev)")
-        
+        out.append(f"[ERROR] RabbitMQ connection failed: {e!r}")
+        out.extend(_generic_help())
+        return False
+    finally:
+        _write(out)
+
+
+def _run_check(name: str, test_func) -> bool:
+    """Run a single check, treating an unexpected exception as a failure"""
+    try:
+        return test_func()
+    except Exception as e:
+        _write([f"\n[ERROR] {name} test failed with exception: {e}"])
         return False
 
 
 def main():
     """Run all tests"""
-    print("=" * 60)
-    print("RabbitMQ Setup Test")
-    print("=" * 60)
+    _write(["=" * 60, "RabbitMQ Setup Test", "=" * 60])
     
-    tests = [
+    # Later checks are pointless if the messaging modules or pika are missing
+    required = [
         ("Imports", test_imports),
         ("Pika Installation", test_pika_installed),
+    ]
+    optional = [
         ("Environment Variables", test_environment_variables),
         ("RabbitMQ Connection", test_rabbitmq_connection),
     ]
     
+    out: List[str] = []
     results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\n[ERROR] {name} test failed with exception: {e}")
-            results.append((name, False))
-    
-    print("\n" + "=" * 60)
-    print("Test Results")
-    print("=" * 60)
+    for name, test_func in required:
+        result = _run_check(name, test_func)
+        results.append((name, result))
+        if not result:
+            break
+    else:
+        for name, test_func in optional:
+            results.append((name, _run_check(name, test_func)))
+    
+    out.append("\n" + "=" * 60)
+    out.append("Test Results")
+    out.append("=" * 60)
     
     for name, result in results:
         status = "[PASS]" if result else "[FAIL]"
-        print(f"{status}: {name}")
+        out.append(f"{status}: {name}")
     
     all_passed = all(result for _, result in results)
     
     if all_passed:
-        print("\n[OK] All tests passed!")
-        print("\nNext steps:")
-        print("  1. Initialize RabbitMQ: python scripts/init_rabbitmq.py")
-        print("  2. Verify in management UI: http://localhost:15672")
+        out.append("\n[OK] All tests passed!")
+        out.append("\nNext steps:")
+        out.append("  1. Initialize RabbitMQ: python scripts/init_rabbitmq.py")
+        out.append("  2. Verify in management UI: http://localhost:15672")
     else:
-        print("\n[ERROR] Some tests failed. Please fix the issues above.")
+        out.append("\n[ERROR] Some tests failed. Please fix the issues above.")
+    
+    _write(out)
+    if not all_passed:
         sys.exit(1)
     
     return 0 if all_passed else 1
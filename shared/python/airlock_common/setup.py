@@ -7,23 +7,42 @@ setup(
     name="airlock-common",
     version="0.1.0",
     description="Shared Python utilities and models for Airlock",
-    packages=["airlock_common"],
+    packages=[
+        "airlock_common",
+        "airlock_common.constants",
+        "airlock_common.db",
+        "airlock_common.db.models",
+        "airlock_common.messaging",
+        "airlock_common.utils",
+    ],
     package_dir={"airlock_common": "."},
     install_requires=[
         "sqlalchemy>=2.0.0,<3.0.0",
         "asyncpg>=0.29.0,<1.0.0",
-        "psycopg2-binary>=2.9.9,<3.0.0",
         "alembic>=1.13.0,<2.0.0",
         "typing-extensions>=4.8.0",
         "PyJWT>=2.9.0,<3.0.0",
         "cryptography>=43.0.0,<44.0.0",
     ],
     extras_require={
+        # Synchronous driver, only needed to run Alembic migrations
+        "sync": [
+            "psycopg2-binary>=2.9.9,<3.0.0",
+        ],
+        # Linear-time regex matching for bulk email validation
+        "re2": [
+            "google-re2>=1.1,<2.0",
+        ],
+        # Faster JSON serialization for JSON log records
+        "fast": [
+            "orjson>=3.9.0,<4.0.0",
+        ],
         "test": [
             "pytest>=7.4.0,<8.0.0",
-            "pytest-asyncio>=0.21.0,<1.0.0",
+            "pytest-asyncio>=0.24.0,<1.0.0",
             "pytest-cov>=4.1.0,<5.0.0",
             "pytest-bdd>=7.1.0,<8.0.0",
+            "pytest-xdist>=3.5.0,<4.0.0",
         ],
     },
     python_requires=">=3.11",
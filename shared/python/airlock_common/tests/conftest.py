@@ -1,6 +1,7 @@
 """
 Pytest configuration for airlock_common tests
 """
+import os
 import pytest
 from pathlib import Path
 from pytest_bdd import scenarios
@@ -10,3 +11,40 @@ feature_dir = Path(__file__).parent / "features"
 if feature_dir.exists():
     scenarios(str(feature_dir / "*.feature"))
 
+
+def pytest_bdd_before_scenario(request, feature, scenario):
+    """Start every scenario with fresh JWT step state"""
+    from .features.steps.jwt_utilities_steps import reset_context
+    
+    reset_context()
+
+
+@pytest.fixture(scope="session")
+def rmq_connection():
+    """Initialized RabbitMQ connection shared by every integration test in the session"""
+    if "RABBITMQ_HOST" not in os.environ:
+        pytest.skip("RABBITMQ_HOST not set, skipping integration test")
+    
+    # pika is optional, so only the integration tests should depend on it
+    pytest.importorskip("pika")
+    from airlock_common.messaging.connection import get_rabbitmq_connection
+    from airlock_common.messaging.init_rabbitmq import initialize_rabbitmq
+    
+    conn = get_rabbitmq_connection()
+    try:
+        conn.connect()
+    except Exception as e:
+        pytest.skip(f"RabbitMQ not available: {e}")
+    
+    # Declare everything once up front; the exchange and DLQ existence tests
+    # then double as verification of the initialization output
+    assert initialize_rabbitmq() is True, "RabbitMQ initialization failed"
+    
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def rmq_channel(rmq_connection):
+    """Channel on the shared connection (reopened if a previous test closed it)"""
+    return rmq_connection.get_channel()
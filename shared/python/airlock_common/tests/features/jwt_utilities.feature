@@ -1,3 +1,4 @@
+@jwt_cpu
 Feature: JWT Token Utilities
   As a developer
   I want to create and validate JWT tokens using shared utilities
@@ -1,18 +1,15 @@
 """
 Step definitions for JWT utilities BDD tests
 """
+import functools
 import os
-import sys
-from datetime import datetime, timedelta, UTC
-from typing import Any, Dict, List
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
 
-import pytest
 import jwt
 from jwt import InvalidTokenError, DecodeError, ExpiredSignatureError
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
-
 from pytest_bdd import given, when, then, parsers, scenario
 from airlock_common import (
     JWTConfig,
@@ -25,8 +22,87 @@ from airlock_common import (
     create_api_key_refresh_token,
 )
 
+# Decoder for the unverified claim checks. AIRLOCK_FAST_JWT=1 swaps in the
+# Rust-backed jwt_rs drop-in when it is installed, to compare timings;
+# verified decodes always go through decode_token (PyJWT). Read leniently:
+# this runs at collection time, and any unrecognised value just means off.
+_claims_jwt = jwt
+if os.getenv("AIRLOCK_FAST_JWT", "").lower() in {"1", "true", "yes", "on"}:
+    try:
+        import jwt_rs as _claims_jwt
+    except ImportError:
+        pass
+
+
+@dataclass(slots=True)
+class StepCtx:
+    """Per-scenario state shared between steps"""
+    secret_key: str = "test-secret-key"
+    algorithm: str = "HS256"
+    issuer: str = "test-issuer"
+    access_token_expiry_minutes: int = 15
+    refresh_token_expiry_days: int = 7
+    token: Optional[str] = None
+    wrong_secret_token: Optional[str] = None
+    user_id: Optional[str] = None
+    username: Optional[str] = None
+    roles: Optional[Tuple[str, ...]] = None
+    scope: Optional[str] = None
+    api_key_id: Optional[int] = None
+    scopes: Optional[Tuple[str, ...]] = None
+    permissions: Optional[Tuple[str, ...]] = None
+    decoded_token: Optional[Dict[str, Any]] = None
+    decode_error: Optional[Exception] = None
+    now_snapshot_epoch: Optional[float] = None
+
+
 # Context for storing test data
-context: Dict[str, Any] = {}
+ctx = StepCtx()
+
+# Error names used in feature files mapped to the exceptions they expect
+_ERROR_CLASS_MAP = {
+    "InvalidTokenError": InvalidTokenError,
+    "DecodeError": DecodeError,
+    "ExpiredSignatureError": ExpiredSignatureError,
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_list(csv: str) -> Tuple[str, ...]:
+    """Split a comma-separated step parameter into stripped items"""
+    return tuple(item.strip() for item in csv.split(","))
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_frozenset(csv: str) -> FrozenSet[str]:
+    """Split a comma-separated step parameter into a set of stripped items"""
+    return frozenset(_parse_list(csv))
+
+
+# Step parameter types for comma-separated values, so the split happens once
+# when the step text is parsed
+_CSV_TYPES = {"csv": _parse_list, "csvset": _parse_frozenset}
+
+
+def reset_context() -> None:
+    """Clear per-scenario state (called before each scenario)"""
+    global ctx
+    ctx = StepCtx()
+
+
+@functools.lru_cache(maxsize=64)
+def _decode_unverified(token: str) -> Dict[str, Any]:
+    """
+    Decode token claims without any verification, caching the result
+    
+    Claim checks in a scenario read the same token repeatedly, and only need
+    the claim dict, so signature, expiry and issuer checks are all skipped.
+    Callers must not mutate the returned dict.
+    """
+    return _claims_jwt.decode(
+        token,
+        options={"verify_signature": False, "verify_exp": False, "verify_iss": False},
+    )
 
 
 @given("JWT configuration is set up")
@@ -38,44 +114,60 @@ def jwt_config_setup():
 @given(parsers.parse('JWT secret key is "{secret_key}"'))
 def jwt_secret_key(secret_key: str):
     """Set JWT secret key"""
-    context["secret_key"] = secret_key
+    ctx.secret_key = secret_key
 
 
 @given(parsers.parse('JWT algorithm is "{algorithm}"'))
 def jwt_algorithm(algorithm: str):
     """Set JWT algorithm"""
-    context["algorithm"] = algorithm
+    ctx.algorithm = algorithm
 
 
 @given(parsers.parse('JWT issuer is "{issuer}"'))
 def jwt_issuer(issuer: str):
     """Set JWT issuer"""
-    context["issuer"] = issuer
+    ctx.issuer = issuer
 
 
 @given(parsers.parse('access token expiry is {minutes:d} minutes'))
 def access_token_expiry(minutes: int):
     """Set access token expiry"""
-    context["access_token_expiry_minutes"] = minutes
+    ctx.access_token_expiry_minutes = minutes
 
 
 @given(parsers.parse('refresh token expiry is {days:d} days'))
 def refresh_token_expiry(days: int):
     """Set refresh token expiry"""
-    context["refresh_token_expiry_days"] = days
+    ctx.refresh_token_expiry_days = days
+
+
+@functools.lru_cache(maxsize=64)
+def _config_for(
+    secret_key: str,
+    algorithm: str,
+    issuer: str,
+    access_token_expiry_minutes: int = 15,
+    refresh_token_expiry_days: int = 7,
+) -> JWTConfig:
+    """Return a shared JWTConfig for the given settings (configs are never mutated)"""
+    return JWTConfig(
+        secret_key=secret_key,
+        algorithm=algorithm,
+        issuer=issuer,
+        access_token_expiry_minutes=access_token_expiry_minutes,
+        refresh_token_expiry_days=refresh_token_expiry_days,
+    )
 
 
 def _get_jwt_config() -> JWTConfig:
-    """Get or create JWT config from context"""
-    if "jwt_config" not in context:
-        context["jwt_config"] = JWTConfig(
-            secret_key=context.get("secret_key", "test-secret-key"),
-            algorithm=context.get("algorithm", "HS256"),
-            issuer=context.get("issuer", "test-issuer"),
-            access_token_expiry_minutes=context.get("access_token_expiry_minutes", 15),
-            refresh_token_expiry_days=context.get("refresh_token_expiry_days", 7),
-        )
-    return context["jwt_config"]
+    """Get the shared JWT config matching the step context settings"""
+    return _config_for(
+        ctx.secret_key,
+        ctx.algorithm,
+        ctx.issuer,
+        ctx.access_token_expiry_minutes,
+        ctx.refresh_token_expiry_days,
+    )
 
 
 @given("I want to create a user access token")
@@ -102,112 +194,80 @@ def want_to_create_api_key_refresh_token():
     pass
 
 
-@when(parsers.parse('I create an access token for user "{user_id}" with username "{username}" and roles "{roles}"'))
-def create_user_access_token_step(user_id: str, username: str, roles: str):
-    """Create user access token"""
-    roles_list = [r.strip() for r in roles.split(",")]
-    config = _get_jwt_config()
-    token = create_user_access_token(
-        config=config,
-        user_id=user_id,
-        username=username,
-        roles=roles_list,
-    )
-    context["token"] = token
-    context["user_id"] = user_id
-    context["username"] = username
-    context["roles"] = roles_list
-
-
-@when(parsers.parse('I create an access token for user "{user_id}" with username "{username}", roles "{roles}" and scope "{scope}"'))
-def create_user_access_token_with_scope(user_id: str, username: str, roles: str, scope: str):
-    """Create user access token with scope"""
-    roles_list = [r.strip() for r in roles.split(",")]
-    config = _get_jwt_config()
-    token = create_user_access_token(
-        config=config,
-        user_id=user_id,
-        username=username,
-        roles=roles_list,
-        scope=scope,
-    )
-    context["token"] = token
-    context["user_id"] = user_id
-    context["scope"] = scope
-
-
-@when(parsers.parse('I create a refresh token for user "{user_id}" with username "{username}" and roles "{roles}"'))
-def create_user_refresh_token_step(user_id: str, username: str, roles: str):
-    """Create user refresh token"""
-    roles_list = [r.strip() for r in roles.split(",")]
-    config = _get_jwt_config()
-    token = create_user_refresh_token(
-        config=config,
-        user_id=user_id,
-        username=username,
-        roles=roles_list,
-    )
-    context["token"] = token
-    context["user_id"] = user_id
-
-
-@when(parsers.parse('I create an access token for API key ID {api_key_id:d} with scopes "{scopes}" and permissions "{permissions}"'))
-def create_api_key_access_token_step(api_key_id: int, scopes: str, permissions: str):
-    """Create API key access token"""
-    scopes_list = [s.strip() for s in scopes.split(",")]
-    permissions_list = [p.strip() for p in permissions.split(",")]
-    config = _get_jwt_config()
-    token = create_api_key_access_token(
-        config=config,
-        api_key_id=api_key_id,
-        scopes=scopes_list,
-        permissions=permissions_list,
-    )
-    context["token"] = token
-    context["api_key_id"] = api_key_id
-    context["scopes"] = scopes_list
-    context["permissions"] = permissions_list
+def _make_user_token_step(creator: Callable[..., str]) -> Callable[..., None]:
+    """Build a step that creates a user token with the configured settings"""
+    def step(user_id: str, username: str, roles: Tuple[str, ...]):
+        ctx.token = creator(
+            config=_get_jwt_config(),
+            user_id=user_id,
+            username=username,
+            roles=roles,
+        )
+        ctx.user_id = user_id
+        ctx.username = username
+        ctx.roles = roles
+    return step
+
+
+def _make_api_key_token_step(creator: Callable[..., str]) -> Callable[..., None]:
+    """Build a step that creates an API key token with the configured settings"""
+    def step(api_key_id: int, scopes: Tuple[str, ...], permissions: Tuple[str, ...]):
+        ctx.token = creator(
+            config=_get_jwt_config(),
+            api_key_id=api_key_id,
+            scopes=scopes,
+            permissions=permissions,
+        )
+        ctx.api_key_id = api_key_id
+        ctx.scopes = scopes
+        ctx.permissions = permissions
+    return step
+
+
+# Steps that differ only in wording and the token creator they call. They are
+# registered from module level so pytest-bdd adds their fixtures to this module.
+_USER_TOKEN_STEPS = (
+    (when, 'I create an access token for user "{user_id}" with username "{username}" and roles "{roles:csv}"', create_user_access_token),
+    (when, 'I create a refresh token for user "{user_id}" with username "{username}" and roles "{roles:csv}"', create_user_refresh_token),
+    (when, 'I call create_user_access_token for user "{user_id}" with username "{username}" and roles "{roles:csv}"', create_user_access_token),
+    (given, 'I have created a user access token for user "{user_id}" with username "{username}" and roles "{roles:csv}"', create_user_access_token),
+)
+_API_KEY_TOKEN_STEPS = (
+    (when, 'I create an access token for API key ID {api_key_id:d} with scopes "{scopes:csv}" and permissions "{permissions:csv}"', create_api_key_access_token),
+    (when, 'I create a refresh token for API key ID {api_key_id:d} with scopes "{scopes:csv}" and permissions "{permissions:csv}"', create_api_key_refresh_token),
+    (when, 'I call create_api_key_access_token for API key ID {api_key_id:d} with scopes "{scopes:csv}" and permissions "{permissions:csv}"', create_api_key_access_token),
+)
 
+for _step, _pattern, _creator in _USER_TOKEN_STEPS:
+    _step(parsers.parse(_pattern, extra_types=_CSV_TYPES))(_make_user_token_step(_creator))
 
-@when(parsers.parse('I create a refresh token for API key ID {api_key_id:d} with scopes "{scopes}" and permissions "{permissions}"'))
-def create_api_key_refresh_token_step(api_key_id: int, scopes: str, permissions: str):
-    """Create API key refresh token"""
-    scopes_list = [s.strip() for s in scopes.split(",")]
-    permissions_list = [p.strip() for p in permissions.split(",")]
-    config = _get_jwt_config()
-    token = create_api_key_refresh_token(
-        config=config,
-        api_key_id=api_key_id,
-        scopes=scopes_list,
-        permissions=permissions_list,
-    )
-    context["token"] = token
-    context["api_key_id"] = api_key_id
+for _step, _pattern, _creator in _API_KEY_TOKEN_STEPS:
+    _step(parsers.parse(_pattern, extra_types=_CSV_TYPES))(_make_api_key_token_step(_creator))
 
 
-@given(parsers.parse('I have created a user access token for user "{user_id}" with username "{username}" and roles "{roles}"'))
-def have_created_user_access_token(user_id: str, username: str, roles: str):
-    """Have created user access token"""
-    roles_list = [r.strip() for r in roles.split(",")]
+@when(parsers.parse('I create an access token for user "{user_id}" with username "{username}", roles "{roles:csv}" and scope "{scope}"', extra_types=_CSV_TYPES))
+def create_user_access_token_with_scope(user_id: str, username: str, roles: Tuple[str, ...], scope: str):
+    """Create user access token with scope"""
     config = _get_jwt_config()
     token = create_user_access_token(
         config=config,
         user_id=user_id,
         username=username,
-        roles=roles_list,
+        roles=roles,
+        scope=scope,
     )
-    context["token"] = token
+    ctx.token = token
+    ctx.user_id = user_id
+    ctx.scope = scope
 
 
 @given(parsers.parse('I have created a token with secret key "{secret_key}"'))
 def have_created_token_with_secret(secret_key: str):
     """Have created token with specific secret"""
-    config = JWTConfig(
-        secret_key=secret_key,
-        algorithm=context.get("algorithm", "HS256"),
-        issuer=context.get("issuer", "test-issuer"),
-        access_token_expiry_minutes=15,
-        refresh_token_expiry_days=7,
+    config = _config_for(
+        secret_key,
+        ctx.algorithm,
+        ctx.issuer,
     )
     token = create_user_access_token(
         config=config,
@@ -215,19 +275,18 @@ def have_created_token_with_secret(secret_key: str):
         username="testuser",
         roles=["admin"],
     )
-    context["token"] = token
-    context["wrong_secret_token"] = token
+    ctx.token = token
+    ctx.wrong_secret_token = token
 
 
 @given(parsers.parse('I have created an expired access token for user "{user_id}"'))
 def have_created_expired_token(user_id: str):
     """Have created expired token"""
-    config = JWTConfig(
-        secret_key=context.get("secret_key", "test-secret-key"),
-        algorithm=context.get("algorithm", "HS256"),
-        issuer=context.get("issuer", "test-issuer"),
+    config = _config_for(
+        ctx.secret_key,
+        ctx.algorithm,
+        ctx.issuer,
         access_token_expiry_minutes=-1,  # Expired
-        refresh_token_expiry_days=7,
     )
     token = create_user_access_token(
         config=config,
@@ -235,18 +294,16 @@ def have_created_expired_token(user_id: str):
         username="testuser",
         roles=["admin"],
     )
-    context["token"] = token
+    ctx.token = token
 
 
 @given(parsers.parse('I have created a token with issuer "{issuer}"'))
 def have_created_token_with_issuer(issuer: str):
     """Have created token with specific issuer"""
-    config = JWTConfig(
-        secret_key=context.get("secret_key", "test-secret-key"),
-        algorithm=context.get("algorithm", "HS256"),
-        issuer=issuer,
-        access_token_expiry_minutes=15,
-        refresh_token_expiry_days=7,
+    config = _config_for(
+        ctx.secret_key,
+        ctx.algorithm,
+        issuer,
     )
     token = create_user_access_token(
         config=config,
@@ -254,84 +311,51 @@ def have_created_token_with_issuer(issuer: str):
         username="testuser",
         roles=["admin"],
     )
-    context["token"] = token
+    ctx.token = token
 
 
 @given(parsers.parse('I have an invalid token string "{token_string}"'))
 def have_invalid_token_string(token_string: str):
     """Have invalid token string"""
-    context["token"] = token_string
+    ctx.token = token_string
 
 
 @when("I decode the token")
-def decode_token_step():
-    """Decode the token"""
-    config = _get_jwt_config()
-    try:
-        decoded = decode_token(context["token"], config)
-        context["decoded_token"] = decoded
-    except Exception as e:
-        context["decode_error"] = e
-        context["decoded_token"] = None
-
-
+@when("I try to decode the token")
 @when("I try to decode the token with correct secret key")
-def try_decode_with_correct_secret():
-    """Try to decode with correct secret"""
-    config = _get_jwt_config()
-    try:
-        decoded = decode_token(context["token"], config)
-        context["decoded_token"] = decoded
-    except Exception as e:
-        context["decode_error"] = e
-        context["decoded_token"] = None
-
-
 @when("I try to decode the token with correct issuer")
-def try_decode_with_correct_issuer():
-    """Try to decode with correct issuer"""
+def _do_decode():
+    """Decode the token with the configured settings"""
     config = _get_jwt_config()
+    ctx.now_snapshot_epoch = time.time()
     try:
-        decoded = decode_token(context["token"], config)
-        context["decoded_token"] = decoded
+        decoded = decode_token(ctx.token, config)
+        ctx.decoded_token = decoded
+        ctx.decode_error = None
     except Exception as e:
-        context["decode_error"] = e
-        context["decoded_token"] = None
-
-
-@when("I try to decode the token")
-def try_decode_token():
-    """Try to decode token"""
-    config = _get_jwt_config()
-    try:
-        decoded = decode_token(context["token"], config)
-        context["decoded_token"] = decoded
-    except Exception as e:
-        context["decode_error"] = e
-        context["decoded_token"] = None
+        ctx.decode_error = e
+        ctx.decoded_token = None
 
 
 @then("the token should be a valid JWT")
 def token_is_valid_jwt():
     """Token is valid JWT"""
-    token = context.get("token")
+    token = ctx.token
     assert token is not None, "Token should exist"
     
-    # Try to decode without verification to check structure
-    try:
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        assert decoded is not None
-    except Exception as e:
-        pytest.fail(f"Token is not a valid JWT: {e}")
+    # Header, payload and signature segments; the claim steps that follow
+    # parse the contents, so only the shape is checked here
+    parts = token.split(".")
+    assert len(parts) == 3 and all(parts), f"Token is not a valid JWT: {token!r}"
 
 
 @then(parsers.parse('the token should contain claim "{claim}" with value "{value}"'))
 def token_contains_claim_string(claim: str, value: str):
     """Token contains claim with string value"""
-    token = context.get("token")
+    token = ctx.token
     assert token is not None
     
-    decoded = jwt.decode(token, options={"verify_signature": False})
+    decoded = _decode_unverified(token)
     assert claim in decoded, f"Claim {claim} should be in token"
     assert decoded[claim] == value, f"Claim {claim} should be {value}, got {decoded[claim]}"
 
@@ -339,72 +363,64 @@ def token_contains_claim_string(claim: str, value: str):
 @then(parsers.parse('the token should contain claim "{claim}" with value {value:d}'))
 def token_contains_claim_int(claim: str, value: int):
     """Token contains claim with integer value"""
-    token = context.get("token")
+    token = ctx.token
     assert token is not None
     
-    decoded = jwt.decode(token, options={"verify_signature": False})
+    decoded = _decode_unverified(token)
     assert claim in decoded, f"Claim {claim} should be in token"
     assert decoded[claim] == value, f"Claim {claim} should be {value}, got {decoded[claim]}"
 
 
-@then(parsers.parse('the token should contain claim "{claim}" with value "{values}"'))
-def token_contains_claim_list(claim: str, values: str):
+@then(parsers.parse('the token should contain claim "{claim}" with value "{values:csvset}"', extra_types=_CSV_TYPES))
+def token_contains_claim_list(claim: str, values: FrozenSet[str]):
     """Token contains claim with list value"""
-    token = context.get("token")
+    token = ctx.token
     assert token is not None
     
-    expected_list = [v.strip() for v in values.split(",")]
-    decoded = jwt.decode(token, options={"verify_signature": False})
+    decoded = _decode_unverified(token)
     assert claim in decoded, f"Claim {claim} should be in token"
     actual_list = decoded[claim]
     assert isinstance(actual_list, list), f"Claim {claim} should be a list"
-    assert set(actual_list) == set(expected_list), f"Claim {claim} should be {expected_list}, got {actual_list}"
+    assert frozenset(actual_list) == values, f"Claim {claim} should be {sorted(values)}, got {actual_list}"
 
 
 @then(parsers.parse('the token should contain claim "{claim}"'))
 def token_contains_claim(claim: str):
     """Token contains claim"""
-    token = context.get("token")
+    token = ctx.token
     assert token is not None
     
-    decoded = jwt.decode(token, options={"verify_signature": False})
+    decoded = _decode_unverified(token)
     assert claim in decoded, f"Claim {claim} should be in token"
 
 
 @then(parsers.parse('the decoded token should contain claim "{claim}" with value "{value}"'))
 def decoded_token_contains_claim_string(claim: str, value: str):
     """Decoded token contains claim with string value"""
-    decoded = context.get("decoded_token")
+    decoded = ctx.decoded_token
     assert decoded is not None, "Token should be decoded"
     assert claim in decoded, f"Claim {claim} should be in decoded token"
     assert decoded[claim] == value, f"Claim {claim} should be {value}, got {decoded[claim]}"
 
 
-@then(parsers.parse('the decoded token should contain claim "{claim}" with value "{values}"'))
-def decoded_token_contains_claim_list(claim: str, values: str):
+@then(parsers.parse('the decoded token should contain claim "{claim}" with value "{values:csvset}"', extra_types=_CSV_TYPES))
+def decoded_token_contains_claim_list(claim: str, values: FrozenSet[str]):
     """Decoded token contains claim with list value"""
-    decoded = context.get("decoded_token")
+    decoded = ctx.decoded_token
     assert decoded is not None, "Token should be decoded"
-    expected_list = [v.strip() for v in values.split(",")]
     assert claim in decoded, f"Claim {claim} should be in decoded token"
     actual_list = decoded[claim]
     assert isinstance(actual_list, list), f"Claim {claim} should be a list"
-    assert set(actual_list) == set(expected_list), f"Claim {claim} should be {expected_list}, got {actual_list}"
+    assert frozenset(actual_list) == values, f"Claim {claim} should be {sorted(values)}, got {actual_list}"
 
 
 @then(parsers.parse('decoding should fail with {error_type}'))
 def decoding_should_fail(error_type: str):
     """Decoding should fail with specific error"""
-    error = context.get("decode_error")
+    error = ctx.decode_error
     assert error is not None, "Decoding should have failed"
     
-    error_class_map = {
-        "InvalidTokenError": InvalidTokenError,
-        "DecodeError": DecodeError,
-        "ExpiredSignatureError": ExpiredSignatureError,
-    }
-    
-    expected_error = error_class_map.get(error_type)
+    expected_error = _ERROR_CLASS_MAP.get(error_type)
     assert expected_error is not None, f"Unknown error type: {error_type}"
     assert isinstance(error, expected_error), f"Expected {error_type}, got {type(error).__name__}"
 
@@ -412,53 +428,48 @@ def decoding_should_fail(error_type: str):
 @then("the token expiry should be approximately 15 minutes from now")
 def token_expiry_approximately_15_minutes():
     """Token expiry is approximately 15 minutes from now"""
-    decoded = context.get("decoded_token")
+    decoded = ctx.decoded_token
     assert decoded is not None, "Token should be decoded"
     
     exp = decoded.get("exp")
     assert exp is not None, "Token should have exp claim"
     
-    now = datetime.now(UTC)
-    expected_exp = now + timedelta(minutes=15)
+    now = ctx.now_snapshot_epoch or time.time()
     
     # Allow 1 minute tolerance
-    exp_dt = datetime.fromtimestamp(exp, UTC)
-    diff = abs((exp_dt - expected_exp).total_seconds())
+    diff = abs(exp - (now + 15 * 60))
     assert diff < 60, f"Expiry should be approximately 15 minutes from now, got {diff} seconds difference"
 
 
 @then("the token expiry should be approximately 7 days from now")
 def token_expiry_approximately_7_days():
     """Token expiry is approximately 7 days from now"""
-    decoded = context.get("decoded_token")
+    decoded = ctx.decoded_token
     assert decoded is not None, "Token should be decoded"
     
     exp = decoded.get("exp")
     assert exp is not None, "Token should have exp claim"
     
-    now = datetime.now(UTC)
-    expected_exp = now + timedelta(days=7)
+    now = ctx.now_snapshot_epoch or time.time()
     
     # Allow 1 hour tolerance
-    exp_dt = datetime.fromtimestamp(exp, UTC)
-    diff = abs((exp_dt - expected_exp).total_seconds())
+    diff = abs(exp - (now + 7 * 24 * 60 * 60))
     assert diff < 3600, f"Expiry should be approximately 7 days from now, got {diff} seconds difference"
 
 
 @then("the token issued at time should be approximately now")
 def token_iat_approximately_now():
     """Token iat is approximately now"""
-    decoded = context.get("decoded_token")
+    decoded = ctx.decoded_token
     assert decoded is not None, "Token should be decoded"
     
     iat = decoded.get("iat")
     assert iat is not None, "Token should have iat claim"
     
-    now = datetime.now(UTC)
-    iat_dt = datetime.fromtimestamp(iat, UTC)
+    now = ctx.now_snapshot_epoch or time.time()
     
     # Allow 5 seconds tolerance
-    diff = abs((iat_dt - now).total_seconds())
+    diff = abs(iat - now)
     assert diff < 5, f"IAT should be approximately now, got {diff} seconds difference"
 
 
@@ -466,33 +477,3 @@ def token_iat_approximately_now():
 def want_to_use_convenience_function():
     """Want to use convenience function"""
     pass
-
-
-@when(parsers.parse('I call create_user_access_token for user "{user_id}" with username "{username}" and roles "{roles}"'))
-def call_create_user_access_token(user_id: str, username: str, roles: str):
-    """Call create_user_access_token"""
-    roles_list = [r.strip() for r in roles.split(",")]
-    config = _get_jwt_config()
-    token = create_user_access_token(
-        config=config,
-        user_id=user_id,
-        username=username,
-        roles=roles_list,
-    )
-    context["token"] = token
-
-
-@when(parsers.parse('I call create_api_key_access_token for API key ID {api_key_id:d} with scopes "{scopes}" and permissions "{permissions}"'))
-def call_create_api_key_access_token(api_key_id: int, scopes: str, permissions: str):
-    """Call create_api_key_access_token"""
-    scopes_list = [s.strip() for s in scopes.split(",")]
-    permissions_list = [p.strip() for p in permissions.split(",")]
-    config = _get_jwt_config()
-    token = create_api_key_access_token(
-        config=config,
-        api_key_id=api_key_id,
-        scopes=scopes_list,
-        permissions=permissions_list,
-    )
-    context["token"] = token
-
@@ -2,7 +2,9 @@
 Tests for database connection
 These tests require a database connection
 """
+import logging
 import pytest
+import pytest_asyncio
 import os
 import asyncio
 from sqlalchemy import text
@@ -10,77 +12,88 @@ from sqlalchemy import text
 from airlock_common import get_db, Base
 from airlock_common.db.database import get_database_url
 
+logger = logging.getLogger(__name__)
+
 
 # Check if database is available
 DATABASE_AVAILABLE = os.getenv("POSTGRES_HOST") is not None or os.getenv("CI") is not None
 
+# Tables created by Database.create_tables()
+EXPECTED_TABLES = (
+    "users",
+    "package_submissions",
+    "package_requests",
+    "packages",
+    "workflows",
+    "check_results",
+    "audit_logs",
+    "api_keys",
+    "package_usage",
+    "license_allowlist",
+)
 
-@pytest.mark.asyncio
+# Statements shared by the tests. asyncpg prepares each one once per pooled
+# connection and reuses it from its statement cache on later executions.
+PING = text("SELECT 1")
+LIST_PUBLIC_TABLES = text("""
+    SELECT table_name 
+    FROM information_schema.tables 
+    WHERE table_schema = 'public'
+    AND table_name = ANY(:names)
+""")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_db():
+    """Database shared by every test in the session so the pool is built once"""
+    db = get_db()
+    yield db
+    await db.close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database not available")
-async def test_database_connection():
+@pytest.mark.xdist_group("database")
+async def test_database_connection(shared_db):
     """Test that database connection works"""
-    db = get_db()
+    # Test connection by executing a simple query
+    async with shared_db.get_session() as session:
+        result = await session.execute(PING)
+        assert result.scalar() == 1
     
-    try:
-        # Test connection by executing a simple query
-        async with db.get_session() as session:
-            result = await session.execute(text("SELECT 1"))
-            assert result.scalar() == 1
-        
-        print("✓ Database connection successful")
-    finally:
-        await db.close()
+    logger.debug("Database connection successful")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 @pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database not available")
-async def test_create_tables():
+@pytest.mark.xdist_group("database")
+async def test_create_tables(shared_db):
     """Test that tables can be created"""
-    db = get_db()
+    # Create all tables
+    await shared_db.create_tables()
+    logger.debug("Tables created successfully")
     
-    try:
-        # Create all tables
-        await db.create_tables()
-        print("✓ Tables created successfully")
-        
-        # Verify tables exist by querying information_schema
-        async with db.get_session() as session:
-            result = await session.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                ORDER BY table_name
-            """))
-            tables = [row[0] for row in result.fetchall()]
-            
-            expected_tables = [
-                "users",
-                "package_submissions",
-                "package_requests",
-                "packages",
-                "workflows",
-                "check_results",
-                "audit_logs",
-                "api_keys",
-                "package_usage",
-                "license_allowlist",
-            ]
-            
-            for table in expected_tables:
-                assert table in tables, f"Table {table} not found"
-        
-        print("✓ All expected tables exist")
+    # Verify tables exist by querying information_schema
+    async with shared_db.get_session() as session:
+        result = await session.execute(
+            LIST_PUBLIC_TABLES,
+            {"names": list(EXPECTED_TABLES)},
+        )
+        tables = {row[0] for row in result}
         
-        # Clean up - drop tables
-        await db.drop_tables()
-        print("✓ Tables dropped successfully")
-        
-    finally:
-        await db.close()
+        missing = set(EXPECTED_TABLES) - tables
+        assert not missing, f"Missing tables: {sorted(missing)}"
+    
+    logger.debug("All expected tables exist")
+    
+    # Clean up - drop tables
+    await shared_db.drop_tables()
+    logger.debug("Tables dropped successfully")
 
 
 @pytest.mark.asyncio
 @pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database not available")
+@pytest.mark.xdist_group("database")
 async def test_database_url_generation():
     """Test that database URL is generated correctly"""
     url = get_database_url()
@@ -91,35 +104,12 @@ async def test_database_url_generation():
     
     # Check that it contains expected components
     assert "postgresql+asyncpg://" in url
-    print(f"✓ Database URL generated: {url.split('@')[1] if '@' in url else url}")
+    logger.debug("Database URL generated")
 
 
 def test_database_url_defaults():
     """Test that database URL uses correct defaults"""
-    # Save original environment
-    original_env = {
-        "POSTGRES_HOST": os.getenv("POSTGRES_HOST"),
-        "POSTGRES_PORT": os.getenv("POSTGRES_PORT"),
-        "POSTGRES_DB": os.getenv("POSTGRES_DB"),
-        "POSTGRES_USER": os.getenv("POSTGRES_USER"),
-        "POSTGRES_PASSWORD": os.getenv("POSTGRES_PASSWORD"),
-    }
+    url = get_database_url(env={})
     
-    try:
-        # Clear environment variables
-        for key in original_env:
-            if key in os.environ:
-                del os.environ[key]
-        
-        # Get URL with defaults
-        url = get_database_url()
-        
-        assert "airlock:airlock@localhost:5432/airlock" in url
-        print("✓ Database URL uses correct defaults")
-        
-    finally:
-        # Restore original environment
-        for key, value in original_env.items():
-            if value is not None:
-                os.environ[key] = value
-
+    assert "airlock:airlock@localhost:5432/airlock" in url
+    logger.debug("Database URL uses correct defaults")
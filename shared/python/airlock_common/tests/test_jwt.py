@@ -0,0 +1,268 @@
+"""
+Tests for JWT utilities
+These tests cover behaviour not exercised by the BDD scenarios and need no
+external services
+"""
+import uuid
+from datetime import datetime, timedelta, UTC
+from enum import Enum
+
+import jwt
+import pytest
+from jwt import InvalidIssuerError, InvalidSignatureError
+
+import airlock_common.utils.jwt as jwt_utils
+from airlock_common import (
+    JWTConfig,
+    clear_token_cache,
+    create_access_token,
+    create_user_access_token,
+    decode_token,
+)
+
+# Long enough for HS512 (64 bytes) so PyJWT does not warn about key length
+SECRET = "test-secret-key-for-jwt-utilities-0123456789-abcdefghijklmnopqrst"
+
+
+class Role(Enum):
+    """Enum claim value, which json (and so PyJWT) refuses to encode"""
+    ADMIN = "admin"
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    """Start and end every test with an empty validation cache"""
+    clear_token_cache()
+    yield
+    clear_token_cache()
+
+
+@pytest.fixture
+def config():
+    """HS256 config used by most tests"""
+    return JWTConfig(secret_key=SECRET, issuer="airlock")
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count the signature verifications done by PyJWT"""
+    calls = []
+    real_decode = jwt_utils.jwt.decode
+    
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+    
+    monkeypatch.setattr(jwt_utils.jwt, "decode", counting_decode)
+    return calls
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() as seen by the token cache"""
+    now = [jwt_utils.time.time()]
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: now[0])
+    return now
+
+
+def test_token_cache_hit(config, decode_calls):
+    """Test that a repeated decode is served from the cache"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    
+    first = decode_token(token, config)
+    second = decode_token(token, config)
+    
+    assert first == second
+    assert len(decode_calls) == 1
+
+
+def test_token_cache_returns_independent_copies(config):
+    """Test that modifying decoded claims does not leak into later decodes"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    
+    decode_token(token, config)
+    cached = decode_token(token, config)
+    cached["roles"].append("admin")
+    cached["username"] = "mallory"
+    
+    claims = decode_token(token, config)
+    assert claims["roles"] == ["submitter"]
+    assert claims["username"] == "alice"
+
+
+def test_token_cache_entry_expires_with_token(config, decode_calls, clock):
+    """Test that a cache entry is not used past the token's exp"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    exp = decode_token(token, config)["exp"]
+    
+    clock[0] = exp - 1
+    decode_token(token, config)
+    assert len(decode_calls) == 1
+    
+    # PyJWT checks exp against the real clock, so the token still verifies;
+    # the cache must have dropped the entry and verified again
+    clock[0] = exp
+    decode_token(token, config)
+    assert len(decode_calls) == 2
+
+
+def test_token_cache_ttl_is_capped(decode_calls, clock):
+    """Test that long-lived tokens are re-verified after the maximum TTL"""
+    config = JWTConfig(secret_key=SECRET, access_token_expiry_minutes=24 * 60)
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    
+    decode_token(token, config)
+    clock[0] += jwt_utils._TOKEN_CACHE_MAX_TTL - 1
+    decode_token(token, config)
+    assert len(decode_calls) == 1
+    
+    clock[0] += 1
+    decode_token(token, config)
+    assert len(decode_calls) == 2
+
+
+def test_token_cache_is_keyed_by_secret(config):
+    """Test that a token cached under one secret is not accepted under another"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    decode_token(token, config)
+    
+    other = JWTConfig(secret_key=SECRET + "-rotated", issuer="airlock")
+    with pytest.raises(InvalidSignatureError):
+        decode_token(token, other)
+
+
+def test_token_cache_does_not_hold_secret(config):
+    """Test that cache keys carry a digest of the secret, not the secret"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    decode_token(token, config)
+    
+    (key,) = jwt_utils._token_cache
+    assert SECRET not in key
+    assert SECRET.encode() not in key
+
+
+def test_token_cache_is_keyed_by_issuer(config):
+    """Test that a token cached for one issuer is not accepted for another"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    decode_token(token, config)
+    
+    other = JWTConfig(secret_key=SECRET, issuer="someone-else")
+    with pytest.raises(InvalidIssuerError):
+        decode_token(token, other)
+    
+    assert decode_token(token, other, verify_iss=False)["sub"] == "1"
+
+
+def test_clear_token_cache(config, decode_calls):
+    """Test that clearing the cache forces verification again"""
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    
+    decode_token(token, config)
+    clear_token_cache()
+    decode_token(token, config)
+    
+    assert len(decode_calls) == 2
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+def test_sign_matches_pyjwt(algorithm):
+    """Test that JWTConfig.sign() produces exactly what jwt.encode() does"""
+    config = JWTConfig(secret_key=SECRET, algorithm=algorithm)
+    claims = {
+        "sub": "1",
+        "exp": 2000000000,
+        "iat": 1700000000,
+        "iss": "airlock",
+        "roles": ["submitter", "reviewer"],
+        "api_key_id": 7,
+    }
+    
+    assert config.sign(claims) == jwt.encode(claims, SECRET, algorithm=algorithm)
+
+
+def test_sign_converts_datetime_time_claims(config):
+    """Test that datetime exp/iat/nbf claims are encoded as epoch seconds"""
+    now = datetime.now(UTC)
+    not_before = now - timedelta(seconds=5)
+    token = create_access_token(
+        config,
+        "1",
+        additional_claims={"nbf": not_before},
+    )
+    
+    claims = decode_token(token, config)
+    assert claims["nbf"] == int(not_before.timestamp())
+    
+    expires = now + timedelta(minutes=5)
+    payload = {"sub": "1", "exp": expires, "iat": now}
+    assert config.sign(payload) == jwt.encode(payload, SECRET, algorithm="HS256")
+    assert isinstance(payload["exp"], datetime), "caller's payload must not be modified"
+
+
+def test_signing_state_is_built_on_first_sign(config):
+    """Test that configs used only for decoding never build signing state"""
+    token = create_user_access_token(JWTConfig(secret_key=SECRET), "1", "alice", ["submitter"])
+    
+    decode_token(token, config)
+    assert config._hmac_proto is None
+    
+    config.sign({"sub": "1"})
+    assert config._hmac_proto is not None
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"sub": "1", "roles": ["submitter"], "api_key_id": 7, "active": True},
+        {"sub": "1", "username": "zoë", "scope": "read:日本"},
+        {"sub": "1", "big": 2 ** 70},
+        {"sub": "1", "ratio": 0.1, "large": 1e16, "small": 1e-7},
+        {"sub": "1", "nan": float("nan"), "inf": float("inf")},
+    ],
+    ids=["ascii", "non-ascii", "big-int", "floats", "non-finite"],
+)
+def test_serializers_agree(config, claims):
+    """Test that sign() serializes claims exactly as jwt.encode() does"""
+    assert config.sign(claims) == jwt.encode(claims, SECRET, algorithm="HS256")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [datetime.now(UTC), uuid.uuid4(), Role.ADMIN],
+    ids=["datetime", "uuid", "enum"],
+)
+def test_serializers_reject_unsupported_types(config, value):
+    """Test that values json cannot encode fail as they do in jwt.encode()"""
+    claims = {"sub": "1", "extra": value}
+    
+    with pytest.raises(TypeError):
+        jwt.encode(claims, SECRET, algorithm="HS256")
+    with pytest.raises(TypeError):
+        config.sign(claims)
+
+
+def test_eddsa_sign_round_trip():
+    """Test that EdDSA tokens signed by JWTConfig verify under PyJWT"""
+    ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    config = JWTConfig(secret_key=private_key.private_bytes_raw().hex(), algorithm="EdDSA")
+    
+    token = create_user_access_token(config, "1", "alice", ["submitter"])
+    
+    header = jwt.get_unverified_header(token)
+    assert header == {"alg": "EdDSA", "typ": "JWT"}
+    claims = jwt.decode(
+        token,
+        private_key.public_key(),
+        algorithms=["EdDSA"],
+        issuer="airlock",
+    )
+    assert claims["roles"] == ["submitter"]
+    assert decode_token(token, config) == claims
+    
+    other = JWTConfig(
+        secret_key=ed25519.Ed25519PrivateKey.generate().private_bytes_raw().hex(),
+        algorithm="EdDSA",
+    )
+    with pytest.raises(InvalidSignatureError):
+        decode_token(token, other)
@@ -17,46 +17,55 @@ from airlock_common.messaging.exchanges import (
 )
 
 
-def test_get_rabbitmq_url_from_env():
+# Check if RabbitMQ is available
+RABBITMQ_AVAILABLE = "RABBITMQ_HOST" in os.environ
+
+EXCHANGES = [
+    PACKAGE_EVENTS_EXCHANGE,
+    WORKFLOW_EVENTS_EXCHANGE,
+    CHECK_EVENTS_EXCHANGE,
+    DLX_EXCHANGE,
+]
+
+DLQ_NAMES = [
+    f"{PACKAGE_EVENTS_EXCHANGE}.dlq",
+    f"{WORKFLOW_EVENTS_EXCHANGE}.dlq",
+    f"{CHECK_EVENTS_EXCHANGE}.dlq",
+]
+
+EXCHANGE_TYPES = frozenset({"topic", "direct", "fanout"})
+
+RABBITMQ_ENV_VARS = ("RABBITMQ_HOST", "RABBITMQ_PORT", "RABBITMQ_USER", "RABBITMQ_PASSWORD", "RABBITMQ_VHOST")
+
+
+def test_get_rabbitmq_url_from_env(monkeypatch):
     """Test that RabbitMQ URL is generated from environment variables"""
-    # Set environment variables
-    os.environ["RABBITMQ_HOST"] = "test-host"
-    os.environ["RABBITMQ_PORT"] = "5673"
-    os.environ["RABBITMQ_USER"] = "test-user"
-    os.environ["RABBITMQ_PASSWORD"] = "test-password"
-    os.environ["RABBITMQ_VHOST"] = "/"
+    monkeypatch.setenv("RABBITMQ_HOST", "test-host")
+    monkeypatch.setenv("RABBITMQ_PORT", "5673")
+    monkeypatch.setenv("RABBITMQ_USER", "test-user")
+    monkeypatch.setenv("RABBITMQ_PASSWORD", "test-password")
+    monkeypatch.setenv("RABBITMQ_VHOST", "/")
     
     url = get_rabbitmq_url()
     assert "test-user:test-password@test-host:5673" in url
     assert "amqp://" in url
-    
-    # Cleanup
-    del os.environ["RABBITMQ_HOST"]
-    del os.environ["RABBITMQ_PORT"]
-    del os.environ["RABBITMQ_USER"]
-    del os.environ["RABBITMQ_PASSWORD"]
-    del os.environ["RABBITMQ_VHOST"]
 
 
-def test_get_rabbitmq_url_defaults():
+def test_get_rabbitmq_url_defaults(monkeypatch):
     """Test that RabbitMQ URL uses defaults when env vars are not set"""
-    # Remove environment variables if they exist
-    for key in ["RABBITMQ_HOST", "RABBITMQ_PORT", "RABBITMQ_USER", "RABBITMQ_PASSWORD", "RABBITMQ_VHOST"]:
-        if key in os.environ:
-            del os.environ[key]
+    for key in RABBITMQ_ENV_VARS:
+        monkeypatch.delenv(key, raising=False)
     
     url = get_rabbitmq_url()
     assert "guest:guest@localhost:5672" in url
     assert "amqp://" in url
 
 
+@pytest.mark.skipif(not RABBITMQ_AVAILABLE, reason="RABBITMQ_HOST not set, skipping integration test")
+@pytest.mark.xdist_group("rabbitmq")
 def test_rabbitmq_connection_context_manager():
     """Test RabbitMQ connection context manager"""
-    # This test requires RabbitMQ to be running
-    # Skip if RABBITMQ_HOST is not set or connection fails
-    if "RABBITMQ_HOST" not in os.environ:
-        pytest.skip("RABBITMQ_HOST not set, skipping integration test")
-    
+    # This test requires RabbitMQ to be running; skip if connection fails
     try:
         with get_rabbitmq_connection() as conn:
             assert conn.connection is not None
@@ -78,96 +87,48 @@ def test_exchange_constants():
 
 
 def test_exchange_configs():
-    """Test that exchange configurations are valid"""
+    """Test that every exchange has a configuration"""
     assert PACKAGE_EVENTS_EXCHANGE in EXCHANGE_CONFIGS
     assert WORKFLOW_EVENTS_EXCHANGE in EXCHANGE_CONFIGS
     assert CHECK_EVENTS_EXCHANGE in EXCHANGE_CONFIGS
     assert DLX_EXCHANGE in EXCHANGE_CONFIGS
-    
-    # Verify all exchanges have required config keys
-    for exchange_name, config in EXCHANGE_CONFIGS.items():
-        assert "type" in config
-        assert "durable" in config
-        assert config["type"] in ["topic", "direct", "fanout"]
-        assert isinstance(config["durable"], bool)
+
+
+@pytest.mark.parametrize(
+    "exchange_name,config",
+    sorted(EXCHANGE_CONFIGS.items()),
+    ids=sorted(EXCHANGE_CONFIGS),
+)
+def test_exchange_config_valid(exchange_name, config):
+    """Test that an exchange configuration has valid required keys"""
+    assert "type" in config
+    assert "durable" in config
+    assert config["type"] in EXCHANGE_TYPES
+    assert isinstance(config["durable"], bool)
 
 
 @pytest.mark.integration
-def test_rabbitmq_exchanges_exist():
-    """Test that all required exchanges exist in RabbitMQ"""
-    # This test requires RabbitMQ to be running and initialized
-    # Skip if RABBITMQ_HOST is not set or connection fails
-    if "RABBITMQ_HOST" not in os.environ:
-        pytest.skip("RABBITMQ_HOST not set, skipping integration test")
-    
+@pytest.mark.skipif(not RABBITMQ_AVAILABLE, reason="RABBITMQ_HOST not set, skipping integration test")
+@pytest.mark.xdist_group("rabbitmq")
+@pytest.mark.parametrize("exchange_name", EXCHANGES)
+def test_rabbitmq_exchange_exists(rmq_channel, exchange_name):
+    """Test that a required exchange exists in RabbitMQ"""
     try:
-        with get_rabbitmq_connection() as conn:
-            channel = conn.get_channel()
-            
-            # Verify all exchanges exist by trying to bind to them
-            # This will raise an exception if the exchange doesn't exist
-            test_queue = "test_queue_verify_exchanges"
-            
-            try:
-                # Declare a temporary queue
-                channel.queue_declare(queue=test_queue, durable=False, auto_delete=True)
-                
-                # Try to bind to each exchange (this verifies they exist)
-                for exchange_name in [
-                    PACKAGE_EVENTS_EXCHANGE,
-                    WORKFLOW_EVENTS_EXCHANGE,
-                    CHECK_EVENTS_EXCHANGE,
-                    DLX_EXCHANGE,
-                ]:
-                    try:
-                        channel.queue_bind(
-                            queue=test_queue,
-                            exchange=exchange_name,
-                            routing_key="test.key",
-                        )
-                        # Unbind after verification
-                        channel.queue_unbind(
-                            queue=test_queue,
-                            exchange=exchange_name,
-                            routing_key="test.key",
-                        )
-                    except Exception as e:
-                        pytest.fail(f"Exchange {exchange_name} does not exist: {e}")
-                
-                # Cleanup
-                channel.queue_delete(queue=test_queue)
-            except Exception as e:
-                pytest.fail(f"Failed to verify exchanges: {e}")
+        # Passive declare raises if the exchange doesn't exist
+        rmq_channel.exchange_declare(exchange=exchange_name, passive=True)
     except Exception as e:
-        pytest.skip(f"RabbitMQ not available: {e}")
+        pytest.fail(f"Exchange {exchange_name} does not exist: {e}")
 
 
 @pytest.mark.integration
-def test_rabbitmq_dlq_exist():
-    """Test that dead letter queues exist in RabbitMQ"""
-    # This test requires RabbitMQ to be running and initialized
-    # Skip if RABBITMQ_HOST is not set or connection fails
-    if "RABBITMQ_HOST" not in os.environ:
-        pytest.skip("RABBITMQ_HOST not set, skipping integration test")
-    
+@pytest.mark.skipif(not RABBITMQ_AVAILABLE, reason="RABBITMQ_HOST not set, skipping integration test")
+@pytest.mark.xdist_group("rabbitmq")
+@pytest.mark.parametrize("dlq_name", DLQ_NAMES)
+def test_rabbitmq_dlq_exists(rmq_channel, dlq_name):
+    """Test that a dead letter queue exists in RabbitMQ"""
     try:
-        with get_rabbitmq_connection() as conn:
-            channel = conn.get_channel()
-            
-            # Verify DLQs exist by checking queue status
-            dlq_names = [
-                f"{PACKAGE_EVENTS_EXCHANGE}.dlq",
-                f"{WORKFLOW_EVENTS_EXCHANGE}.dlq",
-                f"{CHECK_EVENTS_EXCHANGE}.dlq",
-            ]
-            
-            for dlq_name in dlq_names:
-                try:
-                    # Declare queue (will not error if it already exists)
-                    method = channel.queue_declare(queue=dlq_name, passive=True)
-                    assert method is not None
-                except Exception as e:
-                    pytest.fail(f"Dead letter queue {dlq_name} does not exist: {e}")
+        # Passive declare raises if the queue doesn't exist
+        method = rmq_channel.queue_declare(queue=dlq_name, passive=True)
+        assert method is not None
     except Exception as e:
-        pytest.skip(f"RabbitMQ not available: {e}")
-
+        pytest.fail(f"Dead letter queue {dlq_name} does not exist: {e}")
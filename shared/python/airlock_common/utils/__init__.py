@@ -1,7 +1,7 @@
 """
 Utility functions and helpers for Airlock Common
 """
-from .logging import setup_logging, get_logger
+from .logging import setup_logging, get_logger, JsonFormatter
 from .errors import (
     AirlockError,
     ValidationError,
@@ -11,13 +11,21 @@ from .errors import (
     ConflictError,
     ServiceUnavailableError,
 )
-from .validation import validate_email, validate_url, validate_uuid
+from .validation import (
+    validate_email,
+    validate_emails,
+    validate_url,
+    validate_urls,
+    validate_uuid,
+    validate_uuids,
+)
 from .config import get_env, get_env_int, get_env_bool, get_env_list
 from .jwt import (
     JWTConfig,
     create_access_token,
     create_refresh_token,
     decode_token,
+    clear_token_cache,
     create_user_access_token,
     create_user_refresh_token,
     create_api_key_access_token,
@@ -27,6 +35,7 @@ from .jwt import (
 __all__ = [
     "setup_logging",
     "get_logger",
+    "JsonFormatter",
     "AirlockError",
     "ValidationError",
     "NotFoundError",
@@ -35,8 +44,11 @@ __all__ = [
     "ConflictError",
     "ServiceUnavailableError",
     "validate_email",
+    "validate_emails",
     "validate_url",
+    "validate_urls",
     "validate_uuid",
+    "validate_uuids",
     "get_env",
     "get_env_int",
     "get_env_bool",
@@ -45,6 +57,7 @@ __all__ = [
     "create_access_token",
     "create_refresh_token",
     "decode_token",
+    "clear_token_cache",
     "create_user_access_token",
     "create_user_refresh_token",
     "create_api_key_access_token",
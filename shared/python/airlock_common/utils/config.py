@@ -4,6 +4,10 @@ Configuration helpers for Airlock Common
 import os
 from typing import Optional, List, Any
 
+# Accepted spellings for boolean environment variables (compared lowercased)
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on"})
+_FALSE_VALUES = frozenset({"false", "0", "no", "off"})
+
 
 def get_env(key: str, default: Optional[str] = None, required: bool = False) -> Optional[str]:
     """
@@ -49,8 +53,10 @@ def get_env_int(key: str, default: Optional[int] = None, required: bool = False)
         >>> get_env_int("PORT", default=8000)
         8000
     """
-    value = get_env(key, default=None if default is None else str(default), required=required)
+    value = os.getenv(key)
     if value is None:
+        if required and default is None:
+            raise ValueError(f"Environment variable {key} is required")
         return default
     try:
         return int(value)
@@ -77,13 +83,15 @@ def get_env_bool(key: str, default: Optional[bool] = None, required: bool = Fals
         >>> get_env_bool("DEBUG", default=False)
         False
     """
-    value = get_env(key, default=None if default is None else str(default), required=required)
+    value = os.getenv(key)
     if value is None:
+        if required and default is None:
+            raise ValueError(f"Environment variable {key} is required")
         return default
     value_lower = value.lower()
-    if value_lower in ("true", "1", "yes", "on"):
+    if value_lower in _TRUE_VALUES:
         return True
-    elif value_lower in ("false", "0", "no", "off"):
+    elif value_lower in _FALSE_VALUES:
         return False
     else:
         raise ValueError(f"Environment variable {key} must be a valid boolean")
@@ -100,7 +108,8 @@ def get_env_list(key: str, default: Optional[List[str]] = None, separator: str =
         required: Whether the variable is required
     
     Returns:
-        Environment variable value as list
+        Environment variable value as list, or a copy of default if not
+        set (a new list on every call)
     
     Raises:
         ValueError: If required and not set
@@ -109,8 +118,10 @@ def get_env_list(key: str, default: Optional[List[str]] = None, separator: str =
         >>> get_env_list("ALLOWED_ORIGINS", default=["*"])
         ['*']
     """
-    value = get_env(key, default=None if default is None else separator.join(default), required=required)
+    value = os.getenv(key)
     if value is None:
-        return default
+        if required and default is None:
+            raise ValueError(f"Environment variable {key} is required")
+        return None if default is None else list(default)
     return [item.strip() for item in value.split(separator) if item.strip()]
 
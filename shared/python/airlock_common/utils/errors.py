@@ -7,6 +7,13 @@ from typing import Optional, Dict, Any
 class AirlockError(Exception):
     """Base exception for Airlock errors"""
     
+    # Subclasses must declare their own __slots__ (empty unless they add
+    # attributes) to keep attribute access on the slot descriptors
+    __slots__ = ("message", "code", "details")
+    
+    # Error code used when none is passed to __init__
+    CODE = "AIRLOCK_ERROR"
+    
     def __init__(
         self,
         message: str,
@@ -18,63 +25,91 @@ class AirlockError(Exception):
         
         Args:
             message: Error message
-            code: Error code
+            code: Error code (defaults to the class CODE)
             details: Additional error details
         """
         self.message = message
-        self.code = code
+        self.code = code or type(self).CODE
         self.details = details or {}
         super().__init__(self.message)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert error to dictionary"""
+        """
+        Convert error to dictionary
+        
+        Returns a new dictionary on every call (with a copy of details), so
+        callers can modify it without affecting the error or other callers.
+        """
         return {
             "error": {
-                "code": self.code or "AIRLOCK_ERROR",
+                "code": self.code,
                 "message": self.message,
-                "details": self.details,
+                "details": dict(self.details),
             }
         }
+    
+    def __reduce__(self):
+        """Keep slot attributes when pickling (BaseException only saves __dict__)"""
+        # __dict__ still holds anything set outside the slots, e.g. __notes__
+        state = dict(self.__dict__)
+        state.update((name, getattr(self, name)) for name in AirlockError.__slots__)
+        return (type(self), (self.message,), state)
 
 
-class ValidationError(AirlockError):
-    """Validation error"""
+class _CodedError(AirlockError):
+    """Base for errors whose code is fixed by the class CODE"""
+    
+    __slots__ = ()
     
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, code="VALIDATION_ERROR", details=details)
+        """
+        Initialize error
+        
+        Args:
+            message: Error message
+            details: Additional error details
+        """
+        super().__init__(message, details=details)
+
+
+class ValidationError(_CodedError):
+    """Validation error"""
+    
+    __slots__ = ()
+    CODE = "VALIDATION_ERROR"
 
 
-class NotFoundError(AirlockError):
+class NotFoundError(_CodedError):
     """Resource not found error"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, code="NOT_FOUND", details=details)
+    __slots__ = ()
+    CODE = "NOT_FOUND"
 
 
-class UnauthorizedError(AirlockError):
+class UnauthorizedError(_CodedError):
     """Unauthorized error"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, code="UNAUTHORIZED", details=details)
+    __slots__ = ()
+    CODE = "UNAUTHORIZED"
 
 
-class ForbiddenError(AirlockError):
+class ForbiddenError(_CodedError):
     """Forbidden error"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, code="FORBIDDEN", details=details)
+    __slots__ = ()
+    CODE = "FORBIDDEN"
 
 
-class ConflictError(AirlockError):
+class ConflictError(_CodedError):
     """Conflict error"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, code="CONFLICT", details=details)
+    __slots__ = ()
+    CODE = "CONFLICT"
 
 
-class ServiceUnavailableError(AirlockError):
+class ServiceUnavailableError(_CodedError):
     """Service unavailable error"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, code="SERVICE_UNAVAILABLE", details=details)
+    __slots__ = ()
+    CODE = "SERVICE_UNAVAILABLE"
 
@@ -4,15 +4,77 @@ Shared JWT token utilities for Airlock services
 This module provides common JWT token creation and validation functions
 that can be used across all Airlock services to avoid code duplication.
 """
-import secrets
-from datetime import datetime, timedelta, UTC
-from typing import List, Dict, Any, Optional, Union
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from calendar import timegm
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Union
 import jwt
 from jwt import InvalidTokenError, DecodeError, ExpiredSignatureError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cache of successfully validated tokens. Entries are keyed by digests of the
+# token and secret plus the algorithm and issuer it was verified with (the
+# secret itself is never stored), and expire at the token's own
+# exp (capped), so a cache hit never outlives the token. Claims are stored
+# serialized so every hit returns its own copy, nested lists included.
+# Failures are never cached.
+_TOKEN_CACHE_SIZE = 4096
+_TOKEN_CACHE_MAX_TTL = 3600
+_token_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, bytes]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# Digests for the HMAC algorithms JWTConfig.sign() handles itself; any other
+# algorithm is signed through PyJWT
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    """
+    Serialize claims to compact JSON bytes, exactly as PyJWT does
+    
+    Tokens signed by JWTConfig.sign() must be byte-for-byte what
+    jwt.encode() produces, so this sticks to stdlib json: floats, NaN and
+    unsupported types (UUIDs, enums, datetimes) behave just as in PyJWT.
+    """
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# Registered claims that jwt.encode() accepts as datetimes
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def _normalize_time_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert datetime exp/iat/nbf claims to epoch seconds, as jwt.encode() does
+    
+    Returns the payload itself when there is nothing to convert, otherwise a
+    converted copy (the caller's dict is never modified).
+    """
+    converted = {
+        claim: timegm(payload[claim].utctimetuple())
+        for claim in _TIME_CLAIMS
+        if isinstance(payload.get(claim), datetime)
+    }
+    return {**payload, **converted} if converted else payload
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as used for JWT segments"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
 
 class JWTConfig:
     """Configuration for JWT operations"""
@@ -29,7 +91,8 @@ class JWTConfig:
         Initialize JWT configuration
         
         Args:
-            secret_key: JWT secret key for signing tokens
+            secret_key: JWT secret key for signing tokens (for EdDSA, the
+                        hex-encoded 32-byte Ed25519 private key)
             algorithm: JWT algorithm (default: HS256)
             issuer: JWT issuer identifier
             access_token_expiry_minutes: Access token expiry in minutes
@@ -40,6 +103,126 @@ class JWTConfig:
         self.issuer = issuer
         self.access_token_expiry_minutes = access_token_expiry_minutes
         self.refresh_token_expiry_days = refresh_token_expiry_days
+        
+        # Token lifetimes in seconds, added to the issue time of each token
+        self._access_ttl_seconds = int(access_token_expiry_minutes * 60)
+        self._refresh_ttl_seconds = int(refresh_token_expiry_days * 86400)
+        
+        # Signing state, built by _prepare() on first use so configs that
+        # only decode (or are created per request) never pay for it
+        self._header_b64: Optional[bytes] = None
+        self._hmac_proto = None
+        self._signing_key = None
+        self._verification_key: Any = secret_key
+        self._secret_digest: Optional[bytes] = None
+    
+    def _prepare(self) -> None:
+        """
+        Build the signing header and key objects for this config
+        
+        The header and key never change for a config, so they are prepared
+        once instead of on every token. HMAC signing copies a keyed prototype,
+        so the padded key state is only derived here; EdDSA keeps the loaded
+        key and verifies with its public half. The header is set last, so a
+        concurrent sign() never sees it without its key.
+        """
+        digestmod = _HMAC_DIGESTS.get(self.algorithm)
+        if digestmod is not None:
+            self._hmac_proto = hmac.new(self.secret_key.encode(), digestmod=digestmod)
+        elif self.algorithm == "EdDSA":
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+            
+            signing_key = Ed25519PrivateKey.from_private_bytes(bytes.fromhex(self.secret_key))
+            self._verification_key = signing_key.public_key()
+            self._signing_key = signing_key
+        self._header_b64 = _b64url(
+            json.dumps(
+                {"alg": self.algorithm, "typ": "JWT"},
+                separators=(",", ":"),
+                sort_keys=True,
+            ).encode()
+        )
+    
+    def _get_verification_key(self) -> Any:
+        """Key decode_token verifies with (the public key for EdDSA)"""
+        if self.algorithm == "EdDSA" and self._header_b64 is None:
+            self._prepare()
+        return self._verification_key
+    
+    def _get_secret_digest(self) -> bytes:
+        """SHA-256 of the secret, so the token cache never holds the secret itself"""
+        if self._secret_digest is None:
+            self._secret_digest = hashlib.sha256(self.secret_key.encode()).digest()
+        return self._secret_digest
+    
+    def sign(self, payload: Dict[str, Any]) -> str:
+        """
+        Encode and sign a claims dict as a compact JWT
+        
+        HMAC and EdDSA tokens are signed directly with the prepared header
+        and key; other algorithms go through jwt.encode().
+        
+        Like jwt.encode(), datetime values for exp, iat and nbf are
+        converted to epoch seconds.
+        
+        Args:
+            payload: Claims to encode (must be JSON-serializable)
+        
+        Returns:
+            JWT token string
+        """
+        if self._header_b64 is None:
+            self._prepare()
+        if self._hmac_proto is None and self._signing_key is None:
+            return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        
+        payload_b64 = _b64url(_dumps_compact(_normalize_time_claims(payload)))
+        signing_input = self._header_b64 + b"." + payload_b64
+        if self._signing_key is not None:
+            signature = self._signing_key.sign(signing_input)
+        else:
+            mac = self._hmac_proto.copy()
+            mac.update(signing_input)
+            signature = mac.digest()
+        return (signing_input + b"." + _b64url(signature)).decode()
+
+
+def _add_subject_claims(
+    claims: Dict[str, Any],
+    username: Optional[str],
+    roles: Optional[List[str]],
+    scope: Optional[str],
+    api_key_id: Optional[int],
+    scopes: Optional[List[str]],
+    permissions: Optional[List[str]],
+    auth_type: Optional[str],
+    additional_claims: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Add the optional claims shared by access and refresh tokens
+    
+    Empty values are left out, except api_key_id which is kept unless None.
+    additional_claims are applied last and may override anything.
+    
+    Args:
+        claims: Token payload to update in place
+    """
+    for key, value in (
+        # User-specific claims
+        ("username", username),
+        ("roles", roles),
+        ("scope", scope),
+        # API key-specific claims
+        ("scopes", scopes),
+        ("permissions", permissions),
+        ("auth_type", auth_type),
+    ):
+        if value:
+            claims[key] = value
+    if api_key_id is not None:
+        claims["api_key_id"] = api_key_id
+    if additional_claims:
+        claims.update(additional_claims)
 
 
 def create_access_token(
@@ -74,12 +257,8 @@ def create_access_token(
     Returns:
         JWT access token string
     """
-    now = datetime.now(UTC)
-    expires_at = now + timedelta(minutes=config.access_token_expiry_minutes)
-    
-    # Convert datetime to timestamp for JWT
-    exp_timestamp = int(expires_at.timestamp())
-    iat_timestamp = int(now.timestamp())
+    iat_timestamp = time.time_ns() // 1_000_000_000
+    exp_timestamp = iat_timestamp + config._access_ttl_seconds
     
     claims: Dict[str, Any] = {
         "sub": subject,
@@ -89,35 +268,11 @@ def create_access_token(
         "type": "access",
     }
     
-    # Add user-specific claims
-    if username:
-        claims["username"] = username
-    if roles:
-        claims["roles"] = roles
-    if scope:
-        claims["scope"] = scope
-    
-    # Add API key-specific claims
-    if api_key_id is not None:
-        claims["api_key_id"] = api_key_id
-    if scopes:
-        claims["scopes"] = scopes
-    if permissions:
-        claims["permissions"] = permissions
-    if auth_type:
-        claims["auth_type"] = auth_type
-    
-    # Add any additional claims
-    if additional_claims:
-        claims.update(additional_claims)
-    
-    token = jwt.encode(
-        claims,
-        config.secret_key,
-        algorithm=config.algorithm,
+    _add_subject_claims(
+        claims, username, roles, scope, api_key_id, scopes, permissions, auth_type, additional_claims,
     )
     
-    return token
+    return config.sign(claims)
 
 
 def create_refresh_token(
@@ -154,16 +309,8 @@ def create_refresh_token(
     Returns:
         JWT refresh token string
     """
-    now = datetime.now(UTC)
-    expires_at = now + timedelta(days=config.refresh_token_expiry_days)
-    
-    # Generate unique token ID for rotation tracking
-    if include_jti:
-        token_id = secrets.token_urlsafe(32)
-    
-    # Convert datetime to timestamp for JWT
-    exp_timestamp = int(expires_at.timestamp())
-    iat_timestamp = int(now.timestamp())
+    iat_timestamp = time.time_ns() // 1_000_000_000
+    exp_timestamp = iat_timestamp + config._refresh_ttl_seconds
     
     claims: Dict[str, Any] = {
         "sub": subject,
@@ -173,43 +320,19 @@ def create_refresh_token(
         "type": "refresh",
     }
     
-    # Add JTI for token rotation
+    # Add a unique token ID (128 random bits) for token rotation
     if include_jti:
-        claims["jti"] = token_id
-    
-    # Add user-specific claims
-    if username:
-        claims["username"] = username
-    if roles:
-        claims["roles"] = roles
-    if scope:
-        claims["scope"] = scope
-    
-    # Add API key-specific claims
-    if api_key_id is not None:
-        claims["api_key_id"] = api_key_id
-    if scopes:
-        claims["scopes"] = scopes
-    if permissions:
-        claims["permissions"] = permissions
-    if auth_type:
-        claims["auth_type"] = auth_type
-    
-    # Add any additional claims
-    if additional_claims:
-        claims.update(additional_claims)
+        claims["jti"] = _b64url(os.urandom(16)).decode("ascii")
     
-    token = jwt.encode(
-        claims,
-        config.secret_key,
-        algorithm=config.algorithm,
+    _add_subject_claims(
+        claims, username, roles, scope, api_key_id, scopes, permissions, auth_type, additional_claims,
     )
     
-    return token
+    return config.sign(claims)
 
 
 def decode_token(
-    token: str,
+    token: Union[str, bytes],
     config: JWTConfig,
     verify_iss: bool = True,
 ) -> Dict[str, Any]:
@@ -217,9 +340,13 @@ def decode_token(
     Decode and validate JWT token
     
     This is the common token decoding function used across all services.
+    Successful validations are cached until the token expires (at most an
+    hour), so repeated requests with the same bearer token skip signature
+    verification. Each call returns its own copy of the claims, so callers
+    may modify the result freely.
     
     Args:
-        token: JWT token string
+        token: JWT token, as a string or as the raw bytes from a header
         config: JWT configuration
         verify_iss: Whether to verify issuer (default: True)
     
@@ -231,10 +358,26 @@ def decode_token(
         DecodeError: If token cannot be decoded
         ExpiredSignatureError: If token is expired
     """
+    token_bytes = token.encode() if isinstance(token, str) else token
+    cache_key = (
+        hashlib.sha256(token_bytes).digest(),
+        config._get_secret_digest(),
+        config.algorithm,
+        config.issuer if verify_iss else None,
+    )
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            if now < cached[0]:
+                _token_cache.move_to_end(cache_key)
+                return json.loads(cached[1])
+            del _token_cache[cache_key]
+    
     try:
         payload = jwt.decode(
-            token,
-            config.secret_key,
+            token_bytes,
+            config._get_verification_key(),
             algorithms=[config.algorithm],
             options={
                 "verify_signature": True,
@@ -243,10 +386,30 @@ def decode_token(
             },
             issuer=config.issuer if verify_iss else None,
         )
-        return payload
     except (InvalidTokenError, DecodeError, ExpiredSignatureError) as e:
         logger.warning(f"Token decode failed: {e}")
         raise
+    
+    expires_at = now + _TOKEN_CACHE_MAX_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (expires_at, _dumps_compact(payload))
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+
+def clear_token_cache() -> None:
+    """
+    Forget all cached token validations
+    
+    Call after rotating the signing key or revoking tokens, and in tests
+    that need decode_token to verify from scratch.
+    """
+    with _token_cache_lock:
+        _token_cache.clear()
 
 
 # Convenience functions for common token types
@@ -1,15 +1,68 @@
 """
 Logging utilities for Airlock Common
 """
+import json
 import logging
+import os
 import sys
-from typing import Optional
+from typing import Dict, Optional
+
+from .config import get_env_bool
+
+# orjson is optional (the "fast" extra); it serializes straight to bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Level names accepted by setup_logging (case-insensitive); anything else
+# falls back to INFO
+_LEVELS = {
+    "NOTSET": logging.NOTSET,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.CRITICAL,
+}
+
+# Loggers already resolved by get_logger, so repeat calls skip logging's lock
+_logger_cache: Dict[str, logging.Logger] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line
+    
+    The timestamp is emitted as epoch milliseconds, so no strftime call is
+    made per record. Uses orjson when it is installed.
+    
+    Example:
+        >>> handler = logging.StreamHandler()
+        >>> handler.setFormatter(JsonFormatter())
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": int(record.created * 1000),
+            "level": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(entry).decode()
+        return json.dumps(entry)
 
 
 def setup_logging(
     log_level: Optional[str] = None,
     log_format: Optional[str] = None,
     date_format: Optional[str] = None,
+    json_logs: Optional[bool] = None,
 ):
     """
     Setup structured logging for the application
@@ -18,12 +71,15 @@ def setup_logging(
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_format: Log format string
         date_format: Date format string
+        json_logs: Emit JSON lines via JsonFormatter instead of log_format
+                   (defaults to the LOG_JSON environment variable, or False)
+    
+    Raises:
+        ValueError: If LOG_JSON is set to something other than a boolean
     
     Example:
         >>> setup_logging(log_level="INFO")
     """
-    import os
-    
     if log_level is None:
         log_level = os.getenv("LOG_LEVEL", "INFO")
     
@@ -33,12 +89,19 @@ def setup_logging(
     if date_format is None:
         date_format = "%Y-%m-%d %H:%M:%S"
     
+    if json_logs is None:
+        json_logs = get_env_bool("LOG_JSON", default=False)
+    
+    handler = logging.StreamHandler(sys.stdout)
+    if json_logs:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(log_format, date_format))
+    
     # Configure logging
     logging.basicConfig(
-        level=getattr(logging, log_level.upper(), logging.INFO),
-        format=log_format,
-        datefmt=date_format,
-        stream=sys.stdout,
+        level=_LEVELS.get(log_level.upper(), logging.INFO),
+        handlers=[handler],
     )
     
     # Set specific logger levels
@@ -50,6 +113,8 @@ def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance
     
+    Loggers are cached by name, so calling this per request is cheap.
+    
     Args:
         name: Logger name (typically __name__)
     
@@ -60,5 +125,8 @@ def get_logger(name: str) -> logging.Logger:
         >>> logger = get_logger(__name__)
         >>> logger.info("Hello, world!")
     """
-    return logging.getLogger(name)
+    logger = _logger_cache.get(name)
+    if logger is None:
+        logger = _logger_cache[name] = logging.getLogger(name)
+    return logger
 